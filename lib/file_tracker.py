@@ -57,36 +57,34 @@ class FileTracker:
             self._snapshot_cache_time = current_time
             return snapshot
         
-        # Batch file operations
         exclude_dirs = {'.git', '__pycache__', 'venv', '.venv', 'node_modules', '.cursor', 'state'}
-        exclude_exts = {'.pyc', '.pyo', '.pyd', '.so', '.dylib'}
+        exclude_exts = ('.pyc', '.pyo', '.pyd', '.so', '.dylib')
         
-        # Collect all file paths first
-        file_paths = []
-        for root, dirs, files in os.walk(self.project_path):
-            # Modify dirs in-place to prune excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                file_path = Path(root) / file
-                try:
-                    rel_path = str(file_path.relative_to(self.project_path))
-                    # Skip excluded files
-                    if any(rel_path.endswith(ext) for ext in exclude_exts):
-                        continue
-                    if rel_path.startswith('.git/'):
-                        continue
-                    file_paths.append((rel_path, file_path))
-                except (OSError, ValueError):
-                    continue
-        
-        # Batch stat operations
-        for rel_path, file_path in file_paths:
+        # Iterative scandir walk over plain strings: DirEntry type checks reuse the
+        # directory listing, and no Path objects are built per file
+        stack = [(str(self.project_path), '')]
+        while stack:
+            dir_path, rel_dir = stack.pop()
             try:
-                mtime = os.path.getmtime(file_path)
-                snapshot[rel_path] = datetime.fromtimestamp(mtime).isoformat()
-            except (OSError, ValueError):
+                entries = os.scandir(dir_path)
+            except OSError:
                 continue
+            with entries:
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    try:
+                        if entry.is_dir():
+                            # Prune excluded directories; like os.walk, don't follow symlinked dirs
+                            if entry.name not in exclude_dirs and not entry.is_symlink():
+                                stack.append((entry.path, rel_path))
+                            continue
+                        # Skip excluded files
+                        if rel_path.endswith(exclude_exts):
+                            continue
+                        mtime = entry.stat().st_mtime
+                        snapshot[rel_path] = datetime.fromtimestamp(mtime).isoformat()
+                    except (OSError, ValueError):
+                        continue
         
         # Update cache
         self._snapshot_cache = snapshot
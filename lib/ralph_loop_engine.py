@@ -9,10 +9,13 @@ import sys
 import re
 import threading
 import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Callable
 from enum import Enum
 from datetime import datetime
+from functools import lru_cache
 import json
 
 from lib.path_utils import setup_paths
@@ -31,6 +34,321 @@ from lib.ralph_loop_engine.error_recovery import ErrorRecovery
 
 logger = get_logger('ralph_loop')
 
+# Code blocks (triple backticks only, not inline)
+# Group 1: optional specifier (path, language, or empty)
+# Group 2: code content
+_CODE_BLOCK_RE = re.compile(r'```([^\n`]*)\n(.*?)```', re.DOTALL)
+
+# Phases that only call the LLM and never write project files
+_READ_ONLY_PHASES = frozenset({Phase.STUDY, Phase.TEST})
+
+# Common programming language tags (not file paths)
+_LANGUAGE_TAGS = frozenset({
+    'python', 'javascript', 'js', 'typescript', 'ts', 'java', 'cpp', 'c++', 'c',
+    'go', 'rust', 'ruby', 'php', 'swift', 'kotlin', 'scala', 'r', 'sql', 'html',
+    'css', 'json', 'yaml', 'yml', 'xml', 'markdown', 'md', 'bash', 'sh', 'shell',
+    'powershell', 'ps1', 'dockerfile', 'makefile', 'cmake', 'txt', 'plaintext'
+})
+
+# Extension implied by a language tag, used when the content gives no path
+_LANGUAGE_EXTENSIONS = {
+    'python': '.py', 'javascript': '.js', 'js': '.js', 'typescript': '.ts', 'ts': '.ts',
+    'java': '.java', 'cpp': '.cpp', 'c++': '.cpp', 'c': '.c', 'go': '.go', 'rust': '.rs',
+    'ruby': '.rb', 'php': '.php', 'swift': '.swift', 'kotlin': '.kt', 'scala': '.scala',
+    'r': '.r', 'sql': '.sql', 'html': '.html', 'css': '.css', 'json': '.json',
+    'yaml': '.yaml', 'yml': '.yml', 'xml': '.xml', 'markdown': '.md', 'md': '.md',
+    'bash': '.sh', 'sh': '.sh', 'shell': '.sh', 'powershell': '.ps1', 'ps1': '.ps1',
+    'txt': '.txt', 'plaintext': '.txt',
+}
+
+# Explicit file markers in a code block specifier (file:, path:, create:, save:, write:)
+_MARKER_RE = re.compile(r'^(?:file|path|create|save|write):\s*(.+)', re.IGNORECASE)
+
+# Common file names that appear in code comments or content, in priority order
+_COMMON_FILE_NAMES = (
+    (r'package\.json', 'package.json'),
+    (r'main\.js', 'main.js'),
+    (r'index\.html', 'index.html'),
+    (r'index\.js', 'index.js'),
+    (r'app\.js', 'app.js'),
+    (r'preload\.js', 'preload.js'),
+    (r'renderer\.js', 'renderer.js'),
+    (r'styles\.css', 'styles.css'),
+    (r'app\.css', 'app.css'),
+)
+
+# All common names in one alternation (group f<i> for entry i) so the content
+# is scanned once; the names don't overlap in practice, so this finds the
+# same matches as scanning for each name separately
+_COMMON_FILE_RE = re.compile(
+    '|'.join(f'(?P<f{i}>{pattern})' for i, (pattern, _) in enumerate(_COMMON_FILE_NAMES)),
+    re.IGNORECASE
+)
+
+# Per name: the comment-path (/app/package.json) and quoted ("package.json")
+# variants, and the file name to use
+_COMMON_FILE_PATTERNS = tuple(
+    (
+        re.compile(r'[/\\]\w+[/\\]' + pattern, re.IGNORECASE),
+        re.compile(r'["\'`]\s*' + pattern + r'\s*["\'`]', re.IGNORECASE),
+        filename,
+    )
+    for pattern, filename in _COMMON_FILE_NAMES
+)
+
+# Path hints inside code block content
+_PATH_HINT_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:file|path|create|save|write)[:\s]+([^\s\n]+(?:[ \t]+[^\s\n]+)*)',  # Handles paths with spaces, up to the end of the line
+    r'#\s*(?:file|path|create)[:\s]+([^\n]+)',  # Comment-based path hints
+    r'@file\s+([^\s\n]+)',  # @file annotation
+    r'<!--\s*file:\s*([^\s]+)\s*-->',  # HTML comment
+))
+_PATH_PREFIX_RE = re.compile(r'^(?:file|path|create|save|write)[:\s]+', re.IGNORECASE)
+# Characters that mark a hint capture as code (const path = require('path')), not a path
+_CODE_CHARS_RE = re.compile(r'[=(){};]')
+_COMMENT_PATH_RE = re.compile(r'^[/\\]\w+[/\\]')
+
+# JS export names used to derive a filename, and camelCase boundaries within them
+_JS_EXPORT_RE = re.compile(r'(?:module\.exports|export\s+(?:default\s+)?(?:function|class|const|let)\s+)(\w+)')
+_CAMEL_BOUNDARY_RE = re.compile(r'([a-z])([A-Z])')
+
+# Lowercase keyword sets for _infer_file_extension; 'electron' also covers require('electron')
+_ELECTRON_MARKERS = ('electron', 'browserwindow', 'app.whenready', 'ipcrenderer', 'mainwindow', 'webcontents')
+_PYTHON_KEYWORDS = ('def ', 'import ', 'from ', 'class ', 'if __name__', 'print(', '__init__')
+_JS_ONLY_KEYWORDS = ('const ', 'let ', 'var ', 'function ', 'require(')
+_JS_MODULE_KEYWORDS = ('export ', 'import ')
+
+# Prefix checked by _sniff_extension, and shebang interpreters it recognises
+_SNIFF_PREFIX_LEN = 512
+_SHEBANG_EXTENSIONS = {'python': '.py', 'node': '.js', 'nodejs': '.js', 'sh': '.sh', 'bash': '.sh', 'zsh': '.sh'}
+
+# Conventional file name per extension for _generate_meaningful_filename:
+# extension -> (file name, any/all, lowercase markers the content must contain)
+_FILENAME_RULES = {
+    # Electron main process, or a Node.js entry point / HTTP server
+    '.js': ('main.js', any, ('browserwindow', 'app.whenready', 'mainwindow', 'electron',
+                             'require.main === module', 'http.createserver')),
+    '.html': ('index.html', any, ('<html', '<!doctype')),
+    '.json': ('package.json', all, ('"name"', '"version"')),
+    '.css': ('styles.css', any, ('body', 'html')),
+}
+
+# A comment line that only names the file, e.g. // /app/main.js or # file: src/main.py
+# (shebangs are not metadata)
+_METADATA_LINE_RE = re.compile(
+    r'(?://|#(?!!)|<!--)\s*(?:(?:file|path)\s*:\s*)?[\w./\\-]*(?:[/\\][\w.-]+|\.\w{1,5})\s*(?:-->)?',
+    re.IGNORECASE
+)
+
+
+def _strip_leading_metadata(content: str) -> str:
+    """Remove leading blank lines and comment lines that only name the file.
+    
+    Args:
+        content: Code content
+    
+    Returns:
+        Content starting at its first line of real code or prose comment
+    """
+    lines = content.split('\n')
+    start = 0
+    while start < len(lines):
+        stripped = lines[start].strip()
+        if stripped and not _METADATA_LINE_RE.fullmatch(stripped):
+            break
+        start += 1
+    return '\n'.join(lines[start:])
+
+
+def _sniff_extension(content: str) -> Optional[str]:
+    """Detect unambiguous file types from the start of the content alone.
+    
+    Args:
+        content: Code content
+    
+    Returns:
+        File extension for a recognised shebang or HTML document start, else None
+    """
+    prefix = content[:_SNIFF_PREFIX_LEN].lstrip()
+    if prefix.startswith('#!'):
+        # '#!/usr/bin/env python3' -> 'python', '#!/bin/bash' -> 'bash'
+        parts = prefix[2:].split('\n', 1)[0].split()
+        if parts and parts[0].endswith('/env'):
+            parts = parts[1:]
+        if parts:
+            interpreter = parts[0].rsplit('/', 1)[-1].rstrip('0123456789.')
+            return _SHEBANG_EXTENSIONS.get(interpreter)
+        return None
+    
+    prefix_lower = prefix[:15].lower()
+    if prefix_lower.startswith('<!doctype html') or prefix_lower.startswith('<html'):
+        return '.html'
+    return None
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _is_json_document(text: str) -> bool:
+    """Check whether text is a JSON object or array once // comments are cut off.
+    
+    Args:
+        text: Candidate content
+    
+    Returns:
+        True if the whole text decodes as a single JSON object or array
+    """
+    start = len(text) - len(text.lstrip())
+    # Anything not opening with a bracket cannot be a JSON config; skip the parse
+    if not text.startswith(('{', '['), start):
+        return False
+    if '//' in text:
+        text = '\n'.join(line.split('//', 1)[0] for line in text.split('\n'))
+    try:
+        _, end = _JSON_DECODER.raw_decode(text, start)
+    except (ValueError, RecursionError):
+        return False
+    return not text[end:].strip()
+
+
+@lru_cache(maxsize=512)
+def _infer_file_extension(content: str) -> str:
+    """Infer file extension from code content (memoized; the result depends only on content).
+    
+    Args:
+        content: Code content
+    
+    Returns:
+        File extension (e.g., '.py', '.js', etc.)
+    """
+    # Shebangs and HTML document starts settle it without scanning the body
+    sniffed = _sniff_extension(content)
+    if sniffed:
+        return sniffed
+    
+    # Strip leading comments/metadata that might confuse detection
+    # Look for actual code content, not just comments
+    content_clean = content.strip()
+    
+    # Remove leading comment lines (//, #, /* */)
+    lines = content_clean.split('\n')
+    code_lines = []
+    for line in lines:
+        stripped = line.strip()
+        # Skip comment-only lines
+        if stripped.startswith('//') or stripped.startswith('#') or stripped.startswith('/*') or stripped.startswith('*'):
+            continue
+        if stripped and not stripped.startswith('<!--'):
+            code_lines.append(line)
+    
+    # Use cleaned content for detection if we have actual code
+    if code_lines:
+        content_clean = '\n'.join(code_lines)
+    
+    content_lower = content_clean.lower()
+    
+    # Electron/Node.js indicators (check before general JS to prioritize)
+    if any(pattern in content_lower for pattern in _ELECTRON_MARKERS):
+        return '.js'
+    
+    # Package.json detection - look for JSON structure with package.json fields
+    if ('"name"' in content_lower and '"version"' in content_lower) or \
+       ('"main"' in content_lower and '"scripts"' in content_lower):
+        if _is_json_document(content_clean):
+            return '.json'
+    
+    # Python indicators (more specific to avoid false positives); the
+    # JS-only scan is shared with the JavaScript check below
+    has_js_only = any(keyword in content_lower for keyword in _JS_ONLY_KEYWORDS)
+    if not has_js_only and any(keyword in content_lower for keyword in _PYTHON_KEYWORDS):
+        return '.py'
+    
+    # JavaScript/TypeScript indicators
+    if has_js_only or any(keyword in content_lower for keyword in _JS_MODULE_KEYWORDS):
+        # TypeScript detection
+        if 'typescript' in content_lower or 'interface ' in content_lower or \
+           (': ' in content_clean[:200] and ('type ' in content_lower or 'interface' in content_lower)):
+            return '.ts'
+        return '.js'
+    
+    # HTML indicators
+    if content_clean.strip().startswith('<!doctype') or \
+       content_clean.strip().startswith('<html') or \
+       ('<html' in content_lower and '</html>' in content_lower) or \
+       ('<div' in content_lower and '</div>' in content_lower):
+        return '.html'
+    
+    # CSS indicators
+    if '{' in content_clean and ':' in content_clean and \
+       ('color:' in content_lower or 'margin:' in content_lower or 'padding:' in content_lower or
+        'font-' in content_lower or 'background' in content_lower):
+        return '.css'
+    
+    # JSON indicators - improved detection
+    content_stripped = content_clean.strip()
+    if (content_stripped.startswith('{') and content_stripped.endswith('}')) or \
+       (content_stripped.startswith('[') and content_stripped.endswith(']')):
+        if _is_json_document(content_stripped):
+            return '.json'
+    
+    # Markdown indicators
+    if any(marker in content_lower for marker in ['# ', '## ', '```', '**', '* ']):
+        return '.md'
+    
+    # Shell script indicators
+    if content_lower.startswith('#!/bin/') or content_lower.startswith('#!/usr/bin/'):
+        return '.sh'
+    
+    # Default based on content hints - prefer .js over .py for ambiguous cases
+    # If content has any JS-like patterns, default to .js
+    if any(hint in content_lower for hint in ['const', 'let', 'var', 'function', 'require', 'module']):
+        return '.js'
+    
+    # If content looks like structured data but not valid JSON, could be config
+    if '{' in content_clean and '}' in content_clean and ':' in content_clean:
+        return '.json'
+    
+    # Last resort: default to .txt for truly unknown content
+    # Only default to .py if there are Python-like patterns
+    if any(hint in content_lower for hint in ['import ', 'def ', 'class ']):
+        return '.py'
+    
+    return '.txt'
+
+
+@lru_cache(maxsize=512)
+def _generate_meaningful_filename(content: str, extension: str) -> Optional[str]:
+    """Generate a meaningful filename based on content analysis (memoized).
+    
+    Args:
+        content: Code content
+        extension: Inferred file extension
+    
+    Returns:
+        Meaningful filename or None if cannot determine
+    """
+    rule = _FILENAME_RULES.get(extension)
+    if rule is None:
+        return None
+    
+    filename, matches, markers = rule
+    content_lower = content.lower()
+    if matches(marker in content_lower for marker in markers):
+        return filename
+    
+    # Check for function/class names that could be used as filenames
+    # Extract potential names from code
+    if extension == '.js':
+        # Look for module.exports or export default patterns
+        export_match = _JS_EXPORT_RE.search(content)
+        if export_match:
+            name = export_match.group(1).lower()
+            # Convert camelCase to kebab-case
+            name = _CAMEL_BOUNDARY_RE.sub(r'\1-\2', name).lower()
+            return f"{name}{extension}"
+    
+    return None
+
 
 class RalphLoopEngine:
     """Engine for executing Ralph workflow loops."""
@@ -60,6 +378,9 @@ class RalphLoopEngine:
         self.is_running = False
         self.is_paused = False
         self.should_stop = False
+        # Set while the loop may proceed; cleared on pause, set again on resume/stop
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         
         self.phase_history: List[Dict[str, Any]] = []
         self.user_input: Optional[str] = None
@@ -82,13 +403,22 @@ class RalphLoopEngine:
         self.project_name: Optional[str] = None
         self.project_description: Optional[str] = None
         
+        # Progress state (mirrored into the progress tracker)
+        self.phase_start_time: Optional[datetime] = None
+        self.task_start_time: Optional[datetime] = None
+        self.current_phase_progress: float = 0.0
+        self.files_expected: int = 0
+        self.files_created_count: int = 0
+        self.phase_durations: Dict[str, List[float]] = {}
+        
         # Initialize modular components
         self.progress_tracker = ProgressTracker()
         self.progress_tracker.phase_history = self.phase_history
         self.progress_tracker.phase_durations = self.phase_durations
         
         self.status_logger = StatusLogger(self.progress_tracker)
-        self.status_log: List[Dict[str, Any]] = []  # Keep for backward compatibility
+        # Keep for backward compatibility; shares the logger's (bounded) list instead of copying it per entry
+        self.status_log: List[Dict[str, Any]] = self.status_logger.status_log
         
         self.task_parser = TaskParser(
             self.project_path,
@@ -182,8 +512,6 @@ class RalphLoopEngine:
         self.progress_tracker.files_created_count = self.files_created_count
         # Use status logger
         self.status_logger.log(message, phase, current_phase, **kwargs)
-        # Keep status_log for backward compatibility
-        self.status_log = self.status_logger.get_status_log()
     
     def initialize_project(
         self,
@@ -301,6 +629,7 @@ See @fix_plan.md for current tasks.
 """
         
         (self.project_path / '@fix_plan.md').write_text(fix_plan_content)
+        self.task_parser.clear_cache()
         
         # Start file tracking
         self.file_tracker.start_tracking()
@@ -586,6 +915,8 @@ For multiple files, provide each file separately."""
             # Write files to disk (even if validation found issues, but log them)
             written_files = []
             execution_results = []
+            # Parent directories already created for this response
+            created_dirs = set()
             
             for i, file_info in enumerate(files_created):
                 file_path = self.project_path / file_info['path']
@@ -596,8 +927,10 @@ For multiple files, provide each file separately."""
                     validation = validation_results['validated'][i]
                 
                 try:
-                    # Create parent directories if needed
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    # Create parent directories if needed (once per directory)
+                    if file_path.parent not in created_dirs:
+                        file_path.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(file_path.parent)
                     
                     # Only write if validation passed (or if warnings only, or no validation available)
                     should_write = True
@@ -706,23 +1039,19 @@ For multiple files, provide each file separately."""
             'src/main.py'
         """
         files = []
-        # Pattern for code blocks (triple backticks only, not inline)
-        # Group 1: optional specifier (path, language, or empty)
-        # Group 2: code content
-        # Use negative lookbehind/lookahead to avoid matching inline code
-        pattern = r'```([^\n`]*)\n(.*?)```'
-        
-        matches = re.finditer(pattern, response, re.DOTALL)
-        for match in matches:
+        for match in _CODE_BLOCK_RE.finditer(response):
             specifier = match.group(1).strip() if match.group(1) else None
-            content = match.group(2).strip()
+            raw_content = match.group(2).strip()
+            # Path comments like // /app/main.js are not part of the file
+            content = self._strip_leading_metadata(raw_content)
             
             # Skip empty or whitespace-only blocks
             if not content:
                 continue
             
-            # Determine if specifier is a file path or language tag
-            file_path = self._extract_file_path(specifier, content, len(files))
+            # Determine if specifier is a file path or language tag; path
+            # hints may sit in the metadata lines, so look at the raw content
+            file_path = self._extract_file_path(specifier, raw_content, len(files))
             
             files.append({
                 'path': file_path,
@@ -785,65 +1114,32 @@ For multiple files, provide each file separately."""
         Returns:
             File path string (sanitized and validated)
         """
-        # Common programming language tags (not file paths)
-        language_tags = {
-            'python', 'javascript', 'js', 'typescript', 'ts', 'java', 'cpp', 'c++', 'c',
-            'go', 'rust', 'ruby', 'php', 'swift', 'kotlin', 'scala', 'r', 'sql', 'html',
-            'css', 'json', 'yaml', 'yml', 'xml', 'markdown', 'md', 'bash', 'sh', 'shell',
-            'powershell', 'ps1', 'dockerfile', 'makefile', 'cmake', 'txt', 'plaintext'
-        }
-        
-        # If specifier exists, check if it's a path or language
-        if specifier:
-            specifier_lower = specifier.lower().strip()
-            
+        # A known language tag is never a path; skip straight to content extraction
+        if specifier and specifier.lower().strip() not in _LANGUAGE_TAGS:
             # Check for explicit file markers (file:, path:, create:, save:, write:)
-            marker_patterns = [
-                (r'^file:\s*(.+)', 'file:'),
-                (r'^path:\s*(.+)', 'path:'),
-                (r'^create:\s*(.+)', 'create:'),
-                (r'^save:\s*(.+)', 'save:'),
-                (r'^write:\s*(.+)', 'write:'),
-            ]
-            
-            for pattern, marker in marker_patterns:
-                match = re.match(pattern, specifier, re.IGNORECASE)
-                if match:
-                    path = match.group(1).strip()
-                    # Remove quotes if present
-                    path = path.strip('"\'`')
-                    if path:
-                        return self._sanitize_file_path(path)
+            match = _MARKER_RE.match(specifier) if ':' in specifier else None
+            if match:
+                path = match.group(1).strip()
+                # Remove quotes if present
+                path = path.strip('"\'`')
+                if path:
+                    return self._sanitize_file_path(path)
             
             # Check if it looks like a file path
             # Path indicators: contains /, \, or has file extension pattern
             has_path_separator = '/' in specifier or '\\' in specifier
-            has_extension = '.' in specifier and len(specifier.split('.')[-1]) <= 5  # reasonable extension length
+            has_extension = '.' in specifier and len(specifier.rsplit('.', 1)[-1]) <= 5  # reasonable extension length
             
-            # Handle special characters in paths (URL-encoded, escaped, etc.)
-            # Decode common special characters
-            decoded_specifier = specifier
-            # Handle URL-encoded spaces and special chars
-            try:
-                import urllib.parse
-                decoded_specifier = urllib.parse.unquote(specifier)
-            except Exception:
-                pass
-            
-            # If it has path indicators and is not a known language tag
-            if (has_path_separator or has_extension) and specifier_lower not in language_tags:
-                # Return decoded version if it's different and valid
-                if decoded_specifier != specifier and (has_path_separator or has_extension):
-                    return self._sanitize_file_path(decoded_specifier)
-                return self._sanitize_file_path(specifier)
+            if has_path_separator or has_extension:
+                # Handle URL-encoded spaces and special chars; use the decoded form if it differs
+                try:
+                    decoded_specifier = urllib.parse.unquote(specifier)
+                except Exception:
+                    decoded_specifier = specifier
+                return self._sanitize_file_path(decoded_specifier)
             
-            # If it's a known language tag or a description (neither path nor language), ignore it
-            if specifier_lower in language_tags:
-                specifier = None  # Treat as language tag, not path
-            else:
-                # Specifier is neither a path nor a language tag - likely a description
-                # Ignore it and fall through to content extraction or default naming
-                specifier = None
+            # Specifier is neither a path nor a language tag - likely a description
+            # Ignore it and fall through to content extraction or default naming
         
         # Try to extract path from content
         # Look for patterns like "file: path", "path: path", "create: path"
@@ -851,32 +1147,25 @@ For multiple files, provide each file separately."""
         content_preview = content[:500] if len(content) > 500 else content
         
         # First, try to extract common Electron/file patterns from content
-        # Common file names that appear in code comments or content
-        common_file_patterns = [
-            (r'package\.json', 'package.json'),
-            (r'main\.js', 'main.js'),
-            (r'index\.html', 'index.html'),
-            (r'index\.js', 'index.js'),
-            (r'app\.js', 'app.js'),
-            (r'preload\.js', 'preload.js'),
-            (r'renderer\.js', 'renderer.js'),
-            (r'styles\.css', 'styles.css'),
-            (r'app\.css', 'app.css'),
-        ]
-        
         # Check if content mentions common file names (but not in comment patterns like /app/package.json)
-        for pattern, filename in common_file_patterns:
+        # One scan finds every name; then check them in priority order
+        matches_by_name: Dict[int, List[re.Match]] = {}
+        # In a JSON document the names are values ("main": "main.js"), not its own name
+        if not _is_json_document(content):
+            for match in _COMMON_FILE_RE.finditer(content_preview):
+                matches_by_name.setdefault(int(match.lastgroup[1:]), []).append(match)
+        for name_index in sorted(matches_by_name):
+            comment_path_re, quoted_re, filename = _COMMON_FILE_PATTERNS[name_index]
             # Look for the pattern but not as part of a comment path like /app/package.json
             # Check if it appears as a standalone reference or in a meaningful context
-            matches = list(re.finditer(pattern, content_preview, re.IGNORECASE))
-            for match in matches:
+            for match in matches_by_name[name_index]:
                 # Check context around the match
                 start = max(0, match.start() - 20)
                 end = min(len(content_preview), match.end() + 20)
                 context = content_preview[start:end]
                 
                 # Ignore if it's clearly a comment path like /app/package.json or //app/package.json
-                if re.search(r'[/\\]\w+[/\\]' + pattern, context, re.IGNORECASE):
+                if comment_path_re.search(context):
                     continue
                 
                 # If it's in a string literal, comment, or standalone, use it
@@ -885,40 +1174,38 @@ For multiple files, provide each file separately."""
                 if any(char in before_match for char in ['"', "'", '`', '//', '#']):
                     # It's in a string or comment - check if it's a meaningful reference
                     # Look for patterns like "package.json" or loadFile('index.html')
-                    if re.search(r'["\'`]\s*' + pattern + r'\s*["\'`]', context, re.IGNORECASE):
+                    if quoted_re.search(context):
                         return self._sanitize_file_path(filename)
                 else:
                     # Standalone reference - likely the file being created
                     return self._sanitize_file_path(filename)
         
         # Now try explicit path patterns
-        path_patterns = [
-            r'(?:file|path|create|save|write)[:\s]+([^\s\n]+(?:\s+[^\s\n]+)*)',  # Handles paths with spaces
-            r'#\s*(?:file|path|create)[:\s]+([^\n]+)',  # Comment-based path hints
-            r'@file\s+([^\s\n]+)',  # @file annotation
-            r'<!--\s*file:\s*([^\s]+)\s*-->',  # HTML comment
-        ]
-        
-        for pattern in path_patterns:
-            path_match = re.search(pattern, content_preview, re.IGNORECASE)
+        for path_re in _PATH_HINT_RES:
+            path_match = path_re.search(content_preview)
             if path_match:
                 extracted_path = path_match.group(1).strip()
                 # Clean up common prefixes/suffixes
-                extracted_path = re.sub(r'^(?:file|path|create|save|write)[:\s]+', '', extracted_path, flags=re.IGNORECASE)
+                extracted_path = _PATH_PREFIX_RE.sub('', extracted_path)
                 extracted_path = extracted_path.strip('"\'`<>')
                 
                 # Ignore comment patterns like /app/package.json that appear in code
                 # These are usually documentation, not actual file paths
-                if re.match(r'^[/\\]\w+[/\\]', extracted_path):
+                if _COMMENT_PATH_RE.match(extracted_path):
                     # Looks like a comment path - skip it
                     continue
                 
+                # A variable named path or file in code is not a hint
+                if _CODE_CHARS_RE.search(extracted_path):
+                    continue
+                
                 # Limit extracted path length to avoid false matches
                 if extracted_path and len(extracted_path) <= 200:
                     return self._sanitize_file_path(extracted_path)
         
-        # Try to infer file extension from content (language detection)
-        inferred_ext = self._infer_file_extension(content)
+        # A language tag states the file type; otherwise infer it from the content
+        language = specifier.lower().strip() if specifier else ''
+        inferred_ext = _LANGUAGE_EXTENSIONS.get(language) or self._infer_file_extension(content)
         
         # Try to generate meaningful name based on content analysis
         meaningful_name = self._generate_meaningful_filename(content, file_index, inferred_ext)
@@ -940,35 +1227,7 @@ For multiple files, provide each file separately."""
         Returns:
             Meaningful filename or None if cannot determine
         """
-        content_lower = content.lower()
-        
-        # Electron app patterns
-        if extension == '.js' and any(pattern in content_lower for pattern in [
-            'browserwindow', 'app.whenready', 'mainwindow', 'electron'
-        ]):
-            return 'main.js'
-        
-        if extension == '.html' and ('<html' in content_lower or '<!doctype' in content_lower):
-            return 'index.html'
-        
-        if extension == '.json' and ('"name"' in content_lower and '"version"' in content_lower):
-            return 'package.json'
-        
-        if extension == '.css' and ('body' in content_lower or 'html' in content_lower):
-            return 'styles.css'
-        
-        # Check for function/class names that could be used as filenames
-        # Extract potential names from code
-        if extension == '.js':
-            # Look for module.exports or export default patterns
-            export_match = re.search(r'(?:module\.exports|export\s+(?:default\s+)?(?:function|class|const|let)\s+)(\w+)', content)
-            if export_match:
-                name = export_match.group(1).lower()
-                # Convert camelCase to kebab-case
-                name = re.sub(r'([a-z])([A-Z])', r'\1-\2', name).lower()
-                return f"{name}{extension}"
-        
-        return None
+        return _generate_meaningful_filename(content, extension)
     
     def _infer_file_extension(self, content: str) -> str:
         """Infer file extension from code content.
@@ -979,128 +1238,18 @@ For multiple files, provide each file separately."""
         Returns:
             File extension (e.g., '.py', '.js', etc.)
         """
-        # Strip leading comments/metadata that might confuse detection
-        # Look for actual code content, not just comments
-        content_clean = content.strip()
-        
-        # Remove leading comment lines (//, #, /* */)
-        lines = content_clean.split('\n')
-        code_lines = []
-        for line in lines:
-            stripped = line.strip()
-            # Skip comment-only lines
-            if stripped.startswith('//') or stripped.startswith('#') or stripped.startswith('/*') or stripped.startswith('*'):
-                continue
-            if stripped and not stripped.startswith('<!--'):
-                code_lines.append(line)
-        
-        # Use cleaned content for detection if we have actual code
-        if code_lines:
-            content_clean = '\n'.join(code_lines)
-        
-        content_lower = content_clean.lower()
-        
-        # Electron/Node.js indicators (check before general JS to prioritize)
-        electron_patterns = [
-            "require('electron')", "require(\"electron\")",
-            'browserwindow', 'app.whenready', 'ipcrenderer',
-            'electron', 'mainwindow', 'webcontents'
-        ]
-        if any(pattern in content_lower for pattern in electron_patterns):
-            return '.js'
-        
-        # Package.json detection - look for JSON structure with package.json fields
-        if ('"name"' in content_lower and '"version"' in content_lower) or \
-           ('"main"' in content_lower and '"scripts"' in content_lower):
-            # Try to parse as JSON
-            try:
-                import json
-                # Remove leading comments for JSON parsing
-                json_content = content_clean
-                # Remove single-line comments
-                json_lines = []
-                for line in json_content.split('\n'):
-                    if '//' in line:
-                        line = line[:line.index('//')]
-                    json_lines.append(line)
-                json_content = '\n'.join(json_lines)
-                json.loads(json_content)
-                return '.json'
-            except Exception:
-                pass
-        
-        # Python indicators (more specific to avoid false positives)
-        python_keywords = ['def ', 'import ', 'from ', 'class ', 'if __name__', 'print(', '__init__']
-        if any(keyword in content_lower for keyword in python_keywords):
-            # Make sure it's not JavaScript with similar patterns
-            if not any(js_pattern in content_lower for js_pattern in ['const ', 'let ', 'var ', 'function ', 'require(']):
-                return '.py'
-        
-        # JavaScript/TypeScript indicators
-        js_keywords = ['function ', 'const ', 'let ', 'var ', 'export ', 'import ', 'require(']
-        if any(keyword in content_lower for keyword in js_keywords):
-            # TypeScript detection
-            if 'typescript' in content_lower or 'interface ' in content_lower or \
-               (': ' in content_clean[:200] and ('type ' in content_lower or 'interface' in content_lower)):
-                return '.ts'
-            return '.js'
-        
-        # HTML indicators
-        if content_clean.strip().startswith('<!doctype') or \
-           content_clean.strip().startswith('<html') or \
-           ('<html' in content_lower and '</html>' in content_lower) or \
-           ('<div' in content_lower and '</div>' in content_lower):
-            return '.html'
-        
-        # CSS indicators
-        if '{' in content_clean and ':' in content_clean and \
-           ('color:' in content_lower or 'margin:' in content_lower or 'padding:' in content_lower or
-            'font-' in content_lower or 'background' in content_lower):
-            return '.css'
-        
-        # JSON indicators - improved detection
-        content_stripped = content_clean.strip()
-        if (content_stripped.startswith('{') and content_stripped.endswith('}')) or \
-           (content_stripped.startswith('[') and content_stripped.endswith(']')):
-            try:
-                import json
-                # Try parsing after removing comments
-                json_content = content_stripped
-                # Remove single-line comments (//)
-                json_lines = []
-                for line in json_content.split('\n'):
-                    if '//' in line:
-                        line = line[:line.index('//')]
-                    json_lines.append(line)
-                json_content = '\n'.join(json_lines)
-                json.loads(json_content)
-                return '.json'
-            except Exception:
-                pass
-        
-        # Markdown indicators
-        if any(marker in content_lower for marker in ['# ', '## ', '```', '**', '* ']):
-            return '.md'
-        
-        # Shell script indicators
-        if content_lower.startswith('#!/bin/') or content_lower.startswith('#!/usr/bin/'):
-            return '.sh'
-        
-        # Default based on content hints - prefer .js over .py for ambiguous cases
-        # If content has any JS-like patterns, default to .js
-        if any(hint in content_lower for hint in ['const', 'let', 'var', 'function', 'require', 'module']):
-            return '.js'
-        
-        # If content looks like structured data but not valid JSON, could be config
-        if '{' in content_clean and '}' in content_clean and ':' in content_clean:
-            return '.json'
-        
-        # Last resort: default to .txt for truly unknown content
-        # Only default to .py if there are Python-like patterns
-        if any(hint in content_lower for hint in ['import ', 'def ', 'class ']):
-            return '.py'
+        return _infer_file_extension(content)
+    
+    def _strip_leading_metadata(self, content: str) -> str:
+        """Remove leading comment lines that only name the file.
         
-        return '.txt'
+        Args:
+            content: Code content
+            
+        Returns:
+            Content without the leading metadata lines
+        """
+        return _strip_leading_metadata(content)
     
     def _phase_test(self, task: str) -> Dict[str, Any]:
         """Execute Test phase.
@@ -1165,14 +1314,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
         self._log_status(f"Updating status for task: {task}", Phase.UPDATE)
         
         # Mark task as complete in @fix_plan.md
-        fix_plan_path = self.project_path / '@fix_plan.md'
-        if fix_plan_path.exists():
-            content = fix_plan_path.read_text()
-            # Replace first occurrence of task with completed version
-            pattern = rf'(- \[ \] {re.escape(task)})'
-            replacement = f'- [x] {task}'
-            content = re.sub(pattern, replacement, content, count=1)
-            fix_plan_path.write_text(content)
+        self.task_parser.mark_task_complete(task)
         
         self._log_status(f"Status updated: task marked complete", Phase.UPDATE)
         
@@ -1341,12 +1483,14 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
             }
     
     def _wait_for_resume(self) -> None:
-        """Wait for resume signal (for phase-by-phase mode)."""
-        while self.is_paused and not self.should_stop:
-            time.sleep(0.5)
+        """Block until resume() or stop() signals (for phase-by-phase mode)."""
+        if self.is_paused and not self.should_stop:
+            self._resume_event.wait()
     
     def _run_loop(self) -> None:
         """Main loop execution (runs in separate thread)."""
+        # Runs the post-phase file scan of read-only phases alongside their LLM call
+        scan_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ralph-scan')
         try:
             self._log_status("Starting Ralph loop", Phase.IDLE)
             
@@ -1391,6 +1535,12 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
                         if self.should_stop:
                             break
                     
+                    # Study and Test don't touch project files, so scan for changes while
+                    # the LLM call is in flight instead of after it returns
+                    scan = None
+                    if phase in _READ_ONLY_PHASES:
+                        scan = scan_executor.submit(self.file_tracker.update_snapshot)
+                    
                     # Execute phase
                     result = self._execute_phase(phase, self.current_task, previous_output)
                     
@@ -1419,7 +1569,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
                     previous_output = result.get('output')
                     
                     # Update file tracking
-                    changes = self.file_tracker.update_snapshot()
+                    changes = scan.result() if scan else self.file_tracker.update_snapshot()
                     if changes['created'] or changes['modified']:
                         self._log_status(
                             f"Files changed: {len(changes['created'])} created, {len(changes['modified'])} modified",
@@ -1432,6 +1582,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
                     if self.mode == LoopMode.PHASE_BY_PHASE:
                         with self.lock:
                             self.is_paused = True
+                            self._resume_event.clear()
                         self._log_status(f"Paused after {phase.value} phase", phase)
                         self._wait_for_resume()
                 
@@ -1446,6 +1597,8 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
             with self.lock:
                 self.current_phase = Phase.ERROR
                 self.is_running = False
+        finally:
+            scan_executor.shutdown(wait=False)
     
     def start(self, mode: LoopMode = LoopMode.PHASE_BY_PHASE) -> None:
         """Start the loop execution.
@@ -1461,6 +1614,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
             self.is_running = True
             self.is_paused = False
             self.should_stop = False
+            self._resume_event.set()
             self.current_phase = Phase.IDLE
         
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
@@ -1472,6 +1626,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
         """Pause execution."""
         with self.lock:
             self.is_paused = True
+            self._resume_event.clear()
         self._log_status("Loop paused", self.current_phase)
     
     def resume(self, user_input: Optional[str] = None) -> None:
@@ -1483,6 +1638,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
         self.user_input = user_input
         with self.lock:
             self.is_paused = False
+            self._resume_event.set()
         self._log_status("Loop resumed", self.current_phase, user_input=user_input is not None)
     
     def stop(self) -> None:
@@ -1490,6 +1646,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
         with self.lock:
             self.should_stop = True
             self.is_paused = False
+            self._resume_event.set()
         self._log_status("Loop stopped", Phase.IDLE)
         
         if self.thread and self.thread.is_alive():
@@ -1512,6 +1669,7 @@ Provide test cases and validation steps. If tests exist, suggest running them. I
             # If switching from phase-by-phase to non-stop, resume if paused
             if old_mode == LoopMode.PHASE_BY_PHASE and mode == LoopMode.NON_STOP:
                 self.is_paused = False
+                self._resume_event.set()
         
         self._log_status(f"Mode changed: {old_mode.value} → {mode.value}", self.current_phase)
     
@@ -11,17 +11,22 @@ from lib.logging_config import get_logger
 
 logger = get_logger('status_logger')
 
+# Entries kept in the status log; older ones are dropped so long loops don't grow it without limit
+MAX_STATUS_LOG_ENTRIES = 1000
+
 
 class StatusLogger:
     """Manages status logging and callbacks."""
     
-    def __init__(self, progress_tracker: Any):
+    def __init__(self, progress_tracker: Any, max_entries: int = MAX_STATUS_LOG_ENTRIES):
         """Initialize status logger.
         
         Args:
             progress_tracker: ProgressTracker instance for progress calculations
+            max_entries: Maximum number of entries kept in the status log
         """
         self.progress_tracker = progress_tracker
+        self.max_entries = max_entries
         self.status_log: List[Dict[str, Any]] = []
         self.status_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     
@@ -65,6 +70,9 @@ class StatusLogger:
             **kwargs
         }
         self.status_log.append(status_entry)
+        # Trim in place: the engine's status_log aliases this list
+        if len(self.status_log) > self.max_entries:
+            del self.status_log[:-self.max_entries]
         logger.info(f"[{status_entry['phase']}] {message} (Progress: {int(task_progress * 100)}%)")
         self.emit(status_entry)
     
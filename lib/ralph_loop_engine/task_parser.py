@@ -6,12 +6,18 @@ Handles reading, parsing, and managing tasks from @fix_plan.md files.
 
 import re
 from pathlib import Path
-from typing import List, Optional, Callable, Any
+from typing import List, Optional, Callable, Any, Tuple
 from datetime import datetime
 from lib.logging_config import get_logger
 
 logger = get_logger('task_parser')
 
+# Section headings (## and deeper) split @fix_plan.md into sections
+_HEADING_RE = re.compile(r'^[ \t]*(##.*)$', re.MULTILINE)
+# Uncompleted task lines: "- [ ] description"
+_TASK_RE = re.compile(r'^[ \t]*- \[ \](.*)$', re.MULTILINE)
+_PRIORITY_HEADINGS = ('## High Priority', '## Medium Priority', '## Low Priority')
+
 
 class TaskParser:
     """Parser for reading and managing tasks from @fix_plan.md files."""
@@ -41,6 +47,12 @@ class TaskParser:
         self.adapter = adapter
         self.model = model
         self.log_callback = log_callback
+        # (mtime_ns, size, tasks) from the last read of @fix_plan.md
+        self._fix_plan_cache: Optional[Tuple[int, int, List[str]]] = None
+    
+    def clear_cache(self) -> None:
+        """Forget cached tasks so the next read_tasks() re-reads @fix_plan.md."""
+        self._fix_plan_cache = None
     
     def read_tasks(self) -> List[str]:
         """Read tasks from @fix_plan.md.
@@ -49,30 +61,26 @@ class TaskParser:
             List of uncompleted task descriptions
         """
         fix_plan_path = self.project_path / '@fix_plan.md'
-        if not fix_plan_path.exists():
+        try:
+            stat = fix_plan_path.stat()
+        except FileNotFoundError:
             return []
         
-        tasks = []
-        in_priority_section = False
+        # Unchanged since the last read: skip reading and parsing the file
+        cache = self._fix_plan_cache
+        if cache is not None and cache[0] == stat.st_mtime_ns and cache[1] == stat.st_size:
+            return list(cache[2])
         
-        with open(fix_plan_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # Check if we're in a priority section
-                if line.startswith('## High Priority') or line.startswith('## Medium Priority') or line.startswith('## Low Priority'):
-                    in_priority_section = True
-                    continue
-                if line.startswith('##'):
-                    in_priority_section = False
-                    continue
-                
-                # Look for uncompleted tasks
-                if in_priority_section and line.startswith('- [ ]'):
-                    task = line[5:].strip()
-                    if task:
-                        tasks.append(task)
+        # split() yields [preamble, heading, body, heading, body, ...]
+        parts = _HEADING_RE.split(fix_plan_path.read_text())
+        tasks = []
+        for heading, body in zip(parts[1::2], parts[2::2]):
+            # Only uncompleted tasks in the priority sections count
+            if heading.startswith(_PRIORITY_HEADINGS):
+                tasks.extend(task.strip() for task in _TASK_RE.findall(body) if task.strip())
         
-        return tasks
+        self._fix_plan_cache = (stat.st_mtime_ns, stat.st_size, tasks)
+        return list(tasks)
     
     def generate_tasks_from_description(self) -> List[str]:
         """Generate initial tasks from project description using LLM.
@@ -268,6 +276,7 @@ List one task per line, without numbering or bullets."""
         
         content = '\n'.join(new_lines)
         fix_plan_path.write_text(content)
+        self.clear_cache()
         
         return tasks_added
     
@@ -285,13 +294,12 @@ List one task per line, without numbering or bullets."""
             return False
         
         content = fix_plan_path.read_text()
-        # Replace first occurrence of task with completed version
-        pattern = rf'(- \[ \] {re.escape(task)})'
-        replacement = f'- [x] {task}'
-        new_content = re.sub(pattern, replacement, content, count=1)
+        # Replace first occurrence of task with completed version (literal match)
+        new_content = content.replace(f'- [ ] {task}', f'- [x] {task}', 1)
         
         if new_content != content:
             fix_plan_path.write_text(new_content)
+            self.clear_cache()
             return True
         
         return False
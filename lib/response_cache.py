@@ -7,6 +7,7 @@ Provides smart caching with TTL and invalidation.
 import hashlib
 import json
 import time
+from pathlib import Path
 from typing import Optional, Dict, Any
 from collections import OrderedDict
 from lib.logging_config import get_logger
@@ -5,10 +5,46 @@ Pytest configuration and fixtures for Ralph Ollama tests.
 import pytest
 from pathlib import Path
 from typing import Optional
-import sys
 
-from lib.path_utils import setup_paths
-setup_paths()
+
+def pytest_addoption(parser):
+    """Register command-line options for the test suite."""
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        default=False,
+        help="Reuse cached Ollama responses in connection tests instead of calling the server",
+    )
+    parser.addoption(
+        "--browser",
+        action="store_true",
+        default=False,
+        help="Run the Playwright browser tests (starts the UI server and Chromium; needs Ollama)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip browser-marked tests unless --browser is given."""
+    if config.getoption("--browser"):
+        return
+    skip_browser = pytest.mark.skip(reason="browser test; run with --browser")
+    for item in items:
+        if "browser" in item.keywords:
+            item.add_marker(skip_browser)
+
+
+@pytest.fixture(scope="session")
+def ollama_cache_dir(request) -> Optional[Path]:
+    """Return the Ollama response cache directory, or None unless --cached is given.
+
+    Cached results live under .pytest_cache/d/ollama-cache/.
+    """
+    if not request.config.getoption("--cached"):
+        return None
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return None
+    return Path(cache.mkdir("ollama-cache"))
 
 
 @pytest.fixture
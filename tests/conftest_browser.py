@@ -19,11 +19,11 @@ def flask_server() -> Generator[Optional[subprocess.Popen], None, None]:
     """Start Flask server for browser tests."""
     server_process = None
     try:
-        # Start Flask server
+        # Start Flask server; output is discarded: nothing reads it, and a full pipe would block the server
         server_process = subprocess.Popen(
             [sys.executable, str(project_root / 'ui' / 'app.py')],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             cwd=str(project_root)
         )
         
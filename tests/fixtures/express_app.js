@@ -0,0 +1,13 @@
+const express = require('express');
+const app = express();
+
+// Middleware setup
+app.use(express.json());
+app.use(express.urlencoded({ extended: true }));
+
+// Routes
+app.get('/', (req, res) => {
+  res.send('Hello World');
+});
+
+module.exports = app;
@@ -0,0 +1,13 @@
+const fs = require('fs');
+const path = require('path');
+
+function start() {
+  console.log('Application starting...');
+  // Application initialization code
+}
+
+if (require.main === module) {
+  start();
+}
+
+module.exports = { start };
@@ -0,0 +1,11 @@
+import React from 'react';
+
+function Button({ onClick, children }) {
+  return (
+    <button onClick={onClick} className="btn">
+      {children}
+    </button>
+  );
+}
+
+export default Button;
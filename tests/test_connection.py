@@ -4,13 +4,62 @@ Test script for Ollama connection and basic functionality.
 """
 
 import sys
+import hashlib
+import pickle
 from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pytest
 
 from lib.path_utils import setup_paths
 setup_paths()
 
 from lib.ollama_client import OllamaClient
 
+# Set by the autouse fixture below when pytest runs with --cached
+_CACHE_DIR: Optional[Path] = None
+
+
+@pytest.fixture(autouse=True)
+def _use_ollama_cache(ollama_cache_dir):
+    """Point the cached calls in this module at the --cached directory."""
+    global _CACHE_DIR
+    _CACHE_DIR = ollama_cache_dir
+    yield
+    _CACHE_DIR = None
+
+
+def _cached_call(model: Optional[str], prompt: str, fetch: Callable[[], Any]) -> Any:
+    """Return fetch(), reusing a pickled result when caching is enabled.
+    
+    Results are keyed by a hash of (model, prompt), so namespaced model names
+    like user/model never become paths. Only successful, non-empty results are
+    written. Without --cached this simply calls fetch().
+    """
+    if _CACHE_DIR is None:
+        return fetch()
+    
+    key = hashlib.sha256(f"{model or 'default'}\0{prompt}".encode('utf-8')).hexdigest()[:16]
+    cache_file = _CACHE_DIR / f"{key}.pkl"
+    if cache_file.exists():
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    
+    result = fetch()
+    # Only persist usable results; an empty list or a blank response is not
+    # worth replaying. Failures raise, so they never reach the cache.
+    if _is_cacheable(result):
+        with open(cache_file, 'wb') as f:
+            pickle.dump(result, f)
+    return result
+
+
+def _is_cacheable(result: Any) -> bool:
+    """Return True for non-empty results that are safe to replay."""
+    if isinstance(result, dict):
+        return bool(result.get('response')) and not result.get('error')
+    return bool(result)
+
 
 def test_server_connection():
     """Test if Ollama server is accessible."""
@@ -32,7 +81,7 @@ def test_list_models():
     client = OllamaClient()
     
     try:
-        models = client.list_models()
+        models = _cached_call(None, 'list_models', client.list_models)
         if models:
             print(f"✓ Found {len(models)} models:")
             for model in models:
@@ -56,9 +105,9 @@ def test_model_generation(model: str = None):
         model = client.default_model
     
     try:
-        result = client.generate(
-            prompt="Say hello in exactly one word.",
-            model=model
+        prompt = "Say hello in exactly one word."
+        result = _cached_call(
+            model, prompt, lambda: client.generate(prompt=prompt, model=model)
         )
         
         response = result['response'].strip()
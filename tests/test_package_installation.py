@@ -5,124 +5,193 @@ Verifies that the package can be installed and all modules can be imported.
 """
 
 import sys
-import importlib
-from pathlib import Path
+import os
+import operator
+from importlib import import_module
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Any, List, Optional, Tuple
 
-from lib.path_utils import setup_paths
-setup_paths()
 
+# Per-test output buffer; main() sets one per test and writes them all at once
+_LOG_BUFFER: ContextVar[Optional[List[str]]] = ContextVar('_LOG_BUFFER', default=None)
 
-def test_core_imports():
-    """Test that core modules can be imported."""
-    print("Testing core module imports...")
+
+def _log(line: str) -> None:
+    """Append a report line to the current test's buffer, or print it when unbuffered."""
+    buffer = _LOG_BUFFER.get()
+    if buffer is None:
+        print(line)
+    else:
+        buffer.append(line)
+
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+@lru_cache(maxsize=1)
+def _ensure_on_path() -> str:
+    """Add the project root to sys.path on first use, once per process.
+    
+    Called lazily by the probe helpers so that collecting this module
+    (e.g. with pytest -k selecting other tests) leaves sys.path alone.
+    Done locally rather than via lib.path_utils, whose import would
+    run lib/__init__.py before the probes get to test it.
+    """
+    if _PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, _PROJECT_ROOT)
+    return _PROJECT_ROOT
+
+
+def _cached_import(module_path: str, item_name: str) -> Any:
+    """Return an attribute of a module, importing it only if not already loaded.
+    
+    Checks sys.modules first so repeated lookups across tests skip the
+    import machinery entirely.
+    """
+    modules = sys.modules
+    if module_path not in modules:
+        _ensure_on_path()
+        import_module(module_path)
+    return getattr(modules[module_path], item_name)
+
+
+# (test name, (module, names it must export)) for the import probes
+PROBES = (
+    ("Core Imports", ('lib', ('OllamaClient', 'get_llm_response', 'get_config_path', 'is_ollama_enabled'))),
+    ("Integration Imports", ('integration', ('RalphOllamaAdapter', 'call_llm', 'create_ralph_llm_provider'))),
+)
+_PROBES_BY_NAME = dict(PROBES)
+
+
+def _run_probe(module_name: str, names: Tuple[str, ...]) -> bool:
+    """Import a module and check that it provides the given names.
+    
+    Args:
+        module_name: Dotted module name
+        names: Symbols the module must provide
+        
+    Returns:
+        True if the module imports and provides every name
+    """
+    _log(f"Testing {module_name} imports...")
     
     try:
-        from lib import OllamaClient, get_llm_response
-        from lib.config import get_config_path, is_ollama_enabled
-        print("  ✅ lib package imports work")
+        for name in names:
+            _cached_import(module_name, name)
+        _log(f"  ✅ {module_name} package imports work")
         return True
     except ImportError as e:
-        error_msg = str(e)
-        if 'requests' in error_msg:
-            print(f"  ⚠️  Missing dependency: requests (install with: pip install -r requirements.txt)")
-            print("  ℹ️  Package structure is correct, but dependencies need to be installed")
+        if e.name == 'requests':
+            _log(f"  ⚠️  Missing dependency: requests (install with: pip install -r requirements.txt)")
+            _log("  ℹ️  Package structure is correct, but dependencies need to be installed")
         else:
-            print(f"  ❌ Failed to import lib modules: {e}")
+            _log(f"  ❌ Failed to import {module_name} modules: {e}")
+        return False
+    except AttributeError as e:
+        _log(f"  ❌ Failed to import {module_name} modules: {e}")
         return False
 
 
+def test_core_imports():
+    """Test that core modules can be imported."""
+    return _run_probe(*_PROBES_BY_NAME["Core Imports"])
+
+
 def test_integration_imports():
     """Test that integration modules can be imported."""
-    print("Testing integration module imports...")
-    
-    try:
-        from integration import RalphOllamaAdapter, call_llm, create_ralph_llm_provider
-        print("  ✅ integration package imports work")
-        return True
-    except ImportError as e:
-        error_msg = str(e)
-        if 'requests' in error_msg:
-            print(f"  ⚠️  Missing dependency: requests (install with: pip install -r requirements.txt)")
-            print("  ℹ️  Package structure is correct, but dependencies need to be installed")
-        else:
-            print(f"  ❌ Failed to import integration modules: {e}")
-        return False
+    return _run_probe(*_PROBES_BY_NAME["Integration Imports"])
 
 
 def test_optional_imports():
     """Test that optional UI modules can be imported (if installed)."""
-    print("Testing optional UI module imports...")
+    _log("Testing optional UI module imports...")
     
     try:
-        from ui.app import app
-        print("  ✅ UI package imports work (UI dependencies installed)")
+        _cached_import('ui.app', 'app')
+        _log("  ✅ UI package imports work (UI dependencies installed)")
         return True
     except ImportError as e:
-        print(f"  ⚠️  UI imports failed (expected if UI dependencies not installed): {e}")
+        _log(f"  ⚠️  UI imports failed (expected if UI dependencies not installed): {e}")
         return True  # This is OK - UI is optional
 
 
 def test_entry_points():
     """Test that entry points are accessible."""
-    print("Testing entry points...")
+    _log("Testing entry points...")
     
     try:
         # Test main functions exist
-        from lib.ollama_client import main as ollama_main
-        from ui.app import main as ui_main
-        print("  ✅ Entry point functions exist")
+        _cached_import('lib.ollama_client', 'main')
+        _cached_import('ui.app', 'main')
+        _log("  ✅ Entry point functions exist")
         return True
-    except ImportError as e:
-        print(f"  ❌ Entry point functions not found: {e}")
+    except (ImportError, AttributeError) as e:
+        _log(f"  ❌ Entry point functions not found: {e}")
         return False
 
 
+EXPECTED_LIB = frozenset({'OllamaClient', 'get_llm_response'})
+EXPECTED_INT = frozenset({'RalphOllamaAdapter', 'create_ralph_llm_provider', 'call_llm'})
+
+
 def test_package_structure():
     """Test that package structure is correct."""
-    print("Testing package structure...")
+    _log("Testing package structure...")
     
     try:
         # Check __init__ files exist and export correctly
-        from lib import __all__ as lib_all
-        from integration import __all__ as integration_all
+        lib_all = _cached_import('lib', '__all__')
+        integration_all = _cached_import('integration', '__all__')
         
-        expected_lib_exports = ['OllamaClient', 'get_llm_response']
-        expected_integration_exports = ['RalphOllamaAdapter', 'create_ralph_llm_provider', 'call_llm']
-        
-        lib_ok = all(exp in lib_all for exp in expected_lib_exports)
-        integration_ok = all(exp in integration_all for exp in expected_integration_exports)
+        lib_ok = EXPECTED_LIB.issubset(frozenset(lib_all))
+        integration_ok = EXPECTED_INT.issubset(frozenset(integration_all))
         
         if lib_ok and integration_ok:
-            print("  ✅ Package structure is correct")
+            _log("  ✅ Package structure is correct")
             return True
         else:
-            print(f"  ❌ Package structure issues - lib: {lib_ok}, integration: {integration_ok}")
+            _log(f"  ❌ Package structure issues - lib: {lib_ok}, integration: {integration_ok}")
             return False
     except Exception as e:
-        print(f"  ❌ Package structure test failed: {e}")
+        _log(f"  ❌ Package structure test failed: {e}")
         return False
 
 
+@lru_cache(maxsize=1)
+def _config_paths() -> Tuple[os.PathLike, os.PathLike]:
+    """Resolve the Ollama and workflow config paths once per process."""
+    get_config_path = _cached_import('lib.config', 'get_config_path')
+    get_workflow_config_path = _cached_import('lib.config', 'get_workflow_config_path')
+    return get_config_path(), get_workflow_config_path()
+
+
 def test_config_access():
     """Test that config files can be accessed."""
-    print("Testing config file access...")
+    _log("Testing config file access...")
     
     try:
-        from lib.config import get_config_path, get_workflow_config_path
-        
-        config_path = get_config_path()
-        workflow_path = get_workflow_config_path()
+        config_path, workflow_path = _config_paths()
         
         # Check if paths are valid (they might be relative)
-        print(f"  Config path: {config_path}")
-        print(f"  Workflow config path: {workflow_path}")
-        print("  ✅ Config path resolution works")
+        _log(f"  Config path: {config_path}")
+        _log(f"  Workflow config path: {workflow_path}")
+        _log("  ✅ Config path resolution works")
         return True
     except Exception as e:
-        print(f"  ❌ Config access failed: {e}")
+        _log(f"  ❌ Config access failed: {e}")
         return False
 
 
+TESTS = tuple((name, partial(_run_probe, *probe)) for name, probe in PROBES) + (
+    ("Optional UI Imports", test_optional_imports),
+    ("Entry Points", test_entry_points),
+    ("Package Structure", test_package_structure),
+    ("Config Access", test_config_access),
+)
+
+
 def main():
     """Run all package installation tests."""
     print("=" * 70)
@@ -130,23 +199,26 @@ def main():
     print("=" * 70)
     print()
     
+    buffers = []
     results = []
+    for name, fn in TESTS:
+        buffer = []
+        token = _LOG_BUFFER.set(buffer)
+        try:
+            results.append((name, fn()))
+        finally:
+            _LOG_BUFFER.reset(token)
+        buffers.append(buffer)
+    # One write for every test's report instead of a print per line
+    sys.stdout.write("\n".join(chain.from_iterable(buffers)) + "\n")
     
-    results.append(("Core Imports", test_core_imports()))
-    results.append(("Integration Imports", test_integration_imports()))
-    results.append(("Optional UI Imports", test_optional_imports()))
-    results.append(("Entry Points", test_entry_points()))
-    results.append(("Package Structure", test_package_structure()))
-    results.append(("Config Access", test_config_access()))
+    passed = sum(map(operator.itemgetter(1), results))
+    total = len(TESTS)
     
     print()
     print("=" * 70)
     print("Test Summary")
     print("=" * 70)
-    
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
-    
     for name, result in results:
         status = "✅ PASS" if result else "❌ FAIL"
         print(f"  {status}: {name}")
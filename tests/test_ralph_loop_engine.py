@@ -3,25 +3,280 @@ Unit tests for RalphLoopEngine.
 """
 
 import pytest
-import time
+import logging
 import threading
+import time
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import MagicMock, patch
 from lib.ralph_loop_engine import (
     RalphLoopEngine,
     Phase,
     LoopMode
 )
-from integration.ralph_ollama_adapter import RalphOllamaAdapter
+from integration.ralph_ollama_adapter import RalphOllamaAdapter, call_llm
+
+
+# Enum values as they appear in status dicts and log entries
+_STUDY_VALUE = Phase.STUDY.value
+_TEST_VALUE = Phase.TEST.value
+_PHASE_BY_PHASE_VALUE = LoopMode.PHASE_BY_PHASE.value
+
+
+# Canonical @fix_plan.md contents, kept as bytes and written with write_bytes
+_FIX_PLAN_FULL = b"""# Fix Plan
+
+## High Priority
+
+- [ ] Task 1
+- [ ] Task 2
+
+## Medium Priority
+
+- [ ] Task 3
+
+## Low Priority
+
+- [ ] Task 4
+
+## Completed Tasks
+
+- [x] Completed Task
+"""
+
+_FIX_PLAN_SKIP = b"""# Fix Plan
+
+## High Priority
+
+- [ ] Task 1
+- [x] Completed Task
+- [ ] Task 2
+"""
+
+_FIX_PLAN_UPDATE = b"""# Fix Plan
+
+## High Priority
+
+- [ ] Task to complete
+"""
+
+_FIX_PLAN_EMPTY = b"# Fix Plan\n\n## High Priority\n\n"
+
+
+def _has(text):
+    """Predicate matching strings that contain text."""
+    return lambda value: text in value
+
+
+# (response, expected paths, expected contents) for _parse_code_blocks; an
+# expected entry may be a predicate instead of an exact string
+_CODE_BLOCK_CASES = [
+    pytest.param("```src/main.py\ndef main():\n    pass\n```\n",
+                 ['src/main.py'], [_has('def main()')], id="with_path"),
+    # Should use default naming since no path detected
+    pytest.param("```python\ndef main():\n    pass\n```\n",
+                 [_has('generated_0.py')], None, id="with_language"),
+    pytest.param("```file1.py\ncode1\n```\n```file2.py\ncode2\n```\n",
+                 ['file1.py', 'file2.py'], None, id="multiple"),
+    pytest.param("Just some text, no code blocks", [], None, id="no_blocks"),
+    pytest.param("```src/my file.py\ndef main():\n    pass\n```\n",
+                 ['src/my file.py'], [_has('def main()')], id="path_with_spaces"),
+    pytest.param("```file: src/main.py\ndef main():\n    pass\n```\n",
+                 ['src/main.py'], None, id="file_marker"),
+    # Empty and whitespace-only blocks are skipped
+    pytest.param("```python\n\n```\n```src/file.py\ncode here\n```\n",
+                 ['src/file.py'], ['code here'], id="empty_block"),
+    pytest.param("```python\n   \n```\n```src/file.py\ncode here\n```\n",
+                 ['src/file.py'], None, id="whitespace_only"),
+    # Path taken from content when not in the specifier
+    pytest.param("```python\n# file: src/main.py\ndef main():\n    pass\n```\n",
+                 ['src/main.py'], None, id="path_in_content"),
+    pytest.param("```python\n# path: src/my file.py\ndef main():\n    pass\n```\n",
+                 [_has('my file.py')], None, id="path_in_content_with_spaces"),
+    # A python language tag is not a path, but python.py is
+    pytest.param("```python\ndef main():\n    pass\n```\n",
+                 ['generated_0.py'], None, id="language_not_path"),
+    pytest.param("```src/python.py\ndef main():\n    pass\n```\n",
+                 ['src/python.py'], None, id="language_name_as_path"),
+    pytest.param("```/absolute/path/to/file.py\ncode here\n```\n",
+                 ['/absolute/path/to/file.py'], None, id="absolute_path"),
+    pytest.param("```src\\file.py\ncode here\n```\n",
+                 [_has('file.py')], None, id="windows_path"),
+    pytest.param("```\ndef main():\n    pass\n```\n",
+                 ['generated_0.py'], [_has('def main()')], id="no_specifier"),
+    pytest.param("```src/file1.py\ncode1\n```\n```python\ncode2\n```\n```file: src/file3.py\ncode3\n```\n",
+                 ['src/file1.py', 'generated_1.py', 'src/file3.py'], None, id="multiple_formats"),
+    # Nested backticks don't break parsing of the outer block
+    pytest.param("```src/file.py\ncode with ```nested``` blocks\n```\n",
+                 ['src/file.py'], None, id="nested_blocks_ignored"),
+]
+
+# (code, expected extension) pairs for _infer_file_extension
+_INFER_EXTENSION_CASES = [
+    pytest.param("""const fs = require('fs');
+const path = require('path');
+
+function readConfig() {
+  const configPath = path.join(__dirname, 'config.json');
+  return JSON.parse(fs.readFileSync(configPath, 'utf8'));
+}
+
+module.exports = { readConfig };
+""", '.js', id="nodejs"),
+    pytest.param('{"name": "test", "version": "1.0.0", "main": "main.js"}', '.json', id="package_json"),
+    # JSON detection survives a leading path comment
+    pytest.param("""// /app/package.json
+{
+  "name": "test",
+  "version": "1.0.0"
+}""", '.json', id="json_with_comments"),
+    # Ambiguous code defaults to .js instead of .py
+    pytest.param("const x = 5; function test() { return x; }", '.js', id="defaults_to_js_not_py"),
+    # React/JSX code is detected as JavaScript
+    pytest.param("""import React from 'react';
+import { useState } from 'react';
+
+function App() {
+  const [count, setCount] = useState(0);
+  
+  return (
+    <div>
+      <h1>Count: {count}</h1>
+      <button onClick={() => setCount(count + 1)}>Increment</button>
+    </div>
+  );
+}
+
+export default App;
+""", '.js', id="react"),
+    pytest.param("""const express = require('express');
+const app = express();
+
+app.get('/', (req, res) => {
+  res.json({ message: 'Hello World' });
+});
+
+app.listen(3000, () => {
+  console.log('Server running on port 3000');
+});
+""", '.js', id="express"),
+    pytest.param("""interface User {
+  id: number;
+  name: string;
+}
+
+function getUser(id: number): User {
+  return { id, name: 'John Doe' };
+}
+
+export default getUser;
+""", '.ts', id="typescript"),
+    pytest.param("""function calculateTotal(items) {
+  return items.reduce((sum, item) => sum + item.price, 0);
+}
+
+const items = [
+  { name: 'Apple', price: 1.50 },
+  { name: 'Banana', price: 0.75 }
+];
+
+console.log('Total:', calculateTotal(items));
+""", '.js', id="generic_javascript"),
+    # Shebangs and HTML document starts win over keywords in the body
+    pytest.param("#!/bin/bash\nfunction deploy() {\n  echo deploying\n}\n", '.sh', id="shebang_bash"),
+    pytest.param("#!/usr/bin/env node\nconsole.log('hi');\n", '.js', id="shebang_node"),
+    pytest.param("<!DOCTYPE html>\n<html><script>const x = 1;</script></html>", '.html', id="html_with_script"),
+]
+
+
+def _raising_callback(calls):
+    """Build a status callback that records each call and then raises."""
+    def callback(status):
+        calls.append(status)
+        raise Exception("Callback error")
+    return callback
+
+
+@pytest.fixture(scope="session")
+def _shared_adapter() -> RalphOllamaAdapter:
+    """One adapter, built without running __init__, shared by every engine."""
+    return object.__new__(RalphOllamaAdapter)
+
+
+@pytest.fixture(autouse=True)
+def _fast_adapter(request, monkeypatch, _shared_adapter):
+    """Hand engines the shared adapter unless a test is marked real_adapter."""
+    if request.node.get_closest_marker("real_adapter") is None:
+        monkeypatch.setattr(
+            "lib.ralph_loop_engine._engine_module.RalphOllamaAdapter",
+            lambda *args, **kwargs: _shared_adapter,
+        )
+
+
+@pytest.fixture(scope="session")
+def _cached_llm_mock() -> MagicMock:
+    """Build the call_llm mock once; mock_llm resets it for each test."""
+    return MagicMock(spec=call_llm)
+
+
+@pytest.fixture
+def mock_llm(monkeypatch, _cached_llm_mock) -> MagicMock:
+    """Replace the engine's call_llm with a MagicMock for the phase tests."""
+    mock = _cached_llm_mock
+    # lib.ralph_loop_engine is a package that loads the engine file as
+    # _engine_module, so patch the name where the engine looks it up
+    monkeypatch.setattr("lib.ralph_loop_engine._engine_module.call_llm", mock)
+    yield mock
+    mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="session")
+def shared_project_dir(tmp_path_factory) -> Path:
+    """One empty project directory for tests that never write to disk.
+    
+    Tests that create files (initialize_project, the phase tests, fix plans)
+    must keep using tmp_path so this directory stays empty.
+    """
+    return tmp_path_factory.mktemp("ralph_shared")
+
+
+@pytest.fixture(scope="session")
+def _engine_template(tmp_path_factory, _shared_adapter):
+    """Build one engine per session for the stateless parsing helpers.
+    
+    The adapter is passed explicitly because the autouse _fast_adapter patch
+    is function-scoped and not yet active when a session fixture is built.
+    """
+    return RalphLoopEngine(tmp_path_factory.mktemp("parser_engine"), adapter=_shared_adapter)
+
+
+@pytest.fixture
+def engine(_engine_template):
+    """Shared engine for tests that only call pure parsing/inference methods.
+    
+    Every such test gets the same instance, so tests must not change its state
+    (attributes, callbacks, mode, files in its project directory). Rebinding an
+    attribute fails the test at teardown.
+    """
+    before = dict(vars(_engine_template))
+    yield _engine_template
+    assert vars(_engine_template) == before, "tests using the shared engine must not modify it"
+
+
+@pytest.fixture(scope="session")
+def snippets():
+    """Load the code samples in tests/fixtures once per session, keyed by file stem."""
+    fixtures_dir = Path(__file__).parent / 'fixtures'
+    return {p.stem: p.read_text(encoding='utf-8') for p in fixtures_dir.iterdir() if p.is_file()}
 
 
 class TestRalphLoopEngine:
     """Test RalphLoopEngine."""
     
-    def test_init_default(self, tmp_path):
+    @pytest.mark.real_adapter
+    def test_init_default(self, shared_project_dir):
         """Test engine initialization with default adapter."""
-        engine = RalphLoopEngine(tmp_path)
-        assert engine.project_path == tmp_path.resolve()
+        engine = RalphLoopEngine(shared_project_dir)
+        assert engine.project_path == shared_project_dir.resolve()
         assert engine.adapter is not None
         assert isinstance(engine.adapter, RalphOllamaAdapter)
         assert engine.mode == LoopMode.PHASE_BY_PHASE
@@ -30,64 +285,93 @@ class TestRalphLoopEngine:
         assert engine.is_paused is False
         assert engine.should_stop is False
     
-    def test_init_custom_adapter(self, tmp_path):
+    def test_init_custom_adapter(self, shared_project_dir):
         """Test engine initialization with custom adapter."""
-        custom_adapter = RalphOllamaAdapter()
-        engine = RalphLoopEngine(tmp_path, adapter=custom_adapter)
+        custom_adapter = MagicMock(spec=RalphOllamaAdapter)
+        engine = RalphLoopEngine(shared_project_dir, adapter=custom_adapter)
         assert engine.adapter is custom_adapter
     
-    def test_set_status_callback(self, tmp_path):
+    def test_set_status_callback(self, shared_project_dir):
         """Test setting status callback."""
-        engine = RalphLoopEngine(tmp_path)
-        callback = Mock()
+        engine = RalphLoopEngine(shared_project_dir)
+        callback = [].append
         engine.set_status_callback(callback)
-        assert engine.status_callback is callback
+        assert engine.status_logger.status_callback is callback
     
-    def test_emit_status(self, tmp_path):
+    def test_emit_status(self, shared_project_dir):
         """Test status emission via callback."""
-        engine = RalphLoopEngine(tmp_path)
-        callback = Mock()
-        engine.set_status_callback(callback)
+        engine = RalphLoopEngine(shared_project_dir)
+        calls = []
+        engine.set_status_callback(calls.append)
         
         status = {'message': 'test', 'phase': 'idle'}
-        engine._emit_status(status)
-        callback.assert_called_once_with(status)
+        engine.status_logger.emit(status)
+        assert calls == [status]
     
-    def test_emit_status_no_callback(self, tmp_path):
+    def test_emit_status_no_callback(self, shared_project_dir):
         """Test status emission without callback (should not error)."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         status = {'message': 'test', 'phase': 'idle'}
         # Should not raise
-        engine._emit_status(status)
+        engine.status_logger.emit(status)
     
-    def test_emit_status_callback_error(self, tmp_path):
+    def test_emit_status_callback_error(self, shared_project_dir, caplog):
         """Test status emission with callback that raises error."""
-        engine = RalphLoopEngine(tmp_path)
-        callback = Mock(side_effect=Exception("Callback error"))
-        engine.set_status_callback(callback)
+        engine = RalphLoopEngine(shared_project_dir)
+        calls = []
+        engine.set_status_callback(_raising_callback(calls))
         
         status = {'message': 'test', 'phase': 'idle'}
-        # Should not raise, but log error
-        engine._emit_status(status)
-        callback.assert_called_once()
+        # The callback's error is swallowed and logged as a warning
+        with caplog.at_level(logging.WARNING):
+            engine.status_logger.emit(status)
+        assert calls == [status]
+        assert "Error in status callback: Callback error" in caplog.text
     
-    def test_log_status(self, tmp_path):
+    def test_log_status(self, shared_project_dir):
         """Test status logging."""
-        engine = RalphLoopEngine(tmp_path)
-        callback = Mock()
-        engine.set_status_callback(callback)
+        engine = RalphLoopEngine(shared_project_dir)
+        calls = []
+        engine.set_status_callback(calls.append)
         
         engine._log_status("Test message", Phase.STUDY, extra="data")
         
         assert len(engine.status_log) == 1
         entry = engine.status_log[0]
         assert entry['message'] == "Test message"
-        assert entry['phase'] == Phase.STUDY.value
+        assert entry['phase'] == _STUDY_VALUE
         assert entry['extra'] == "data"
         assert 'timestamp' in entry
         
-        callback.assert_called_once()
+        assert len(calls) == 1
     
+    def test_status_log_is_bounded(self, shared_project_dir):
+        """Test that the status log keeps only the newest entries."""
+        engine = RalphLoopEngine(shared_project_dir)
+        engine.status_logger.max_entries = 3
+        
+        for i in range(5):
+            engine._log_status(f"Message {i}", Phase.STUDY)
+        
+        assert [entry['message'] for entry in engine.status_log] == ["Message 2", "Message 3", "Message 4"]
+    
+    def test_initialize_project_calls(self, tmp_path):
+        """Test project initialization creates the expected paths, without touching disk."""
+        engine = RalphLoopEngine(tmp_path)
+        with patch.object(Path, 'mkdir', autospec=True) as mkdir, \
+                patch.object(Path, 'write_text', autospec=True) as write_text:
+            engine.initialize_project("Test Project", "Test description", "Initial task")
+        
+        root = tmp_path.resolve()
+        created = [c.args[0] for c in mkdir.call_args_list]
+        assert created == [root, root / 'src', root / 'tests', root / 'docs', root / 'specs']
+        
+        written = {c.args[0]: c.args[1] for c in write_text.call_args_list}
+        assert set(written) == {root / 'README.md', root / '@fix_plan.md'}
+        assert "Test Project" in written[root / 'README.md']
+        assert "- [ ] Initial task" in written[root / '@fix_plan.md']
+    
+    @pytest.mark.io
     def test_initialize_project(self, tmp_path):
         """Test project initialization."""
         engine = RalphLoopEngine(tmp_path)
@@ -113,6 +397,7 @@ class TestRalphLoopEngine:
         assert "Initial task" in content
         assert "- [ ] Initial task" in content
     
+    @pytest.mark.io
     def test_initialize_project_no_initial_task(self, tmp_path):
         """Test project initialization without initial task."""
         engine = RalphLoopEngine(tmp_path)
@@ -123,91 +408,53 @@ class TestRalphLoopEngine:
         content = fix_plan.read_text()
         assert "Initial task" not in content
     
-    def test_read_fix_plan_empty(self, tmp_path):
+    def test_read_fix_plan_empty(self, shared_project_dir):
         """Test reading fix plan when file doesn't exist."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         tasks = engine._read_fix_plan()
         assert tasks == []
     
-    def test_read_fix_plan_with_tasks(self, tmp_path):
-        """Test reading fix plan with tasks."""
-        engine = RalphLoopEngine(tmp_path)
-        fix_plan = tmp_path / '@fix_plan.md'
-        fix_plan.write_text("""# Fix Plan
-
-## High Priority
-
-- [ ] Task 1
-- [ ] Task 2
-
-## Medium Priority
-
-- [ ] Task 3
-
-## Low Priority
-
-- [ ] Task 4
-
-## Completed Tasks
-
-- [x] Completed Task
-""")
-        tasks = engine._read_fix_plan()
-        assert len(tasks) == 4
-        assert "Task 1" in tasks
-        assert "Task 2" in tasks
-        assert "Task 3" in tasks
-        assert "Task 4" in tasks
-        assert "Completed Task" not in tasks
-    
-    def test_read_fix_plan_skips_completed(self, tmp_path):
-        """Test that completed tasks are not included."""
+    @pytest.mark.io
+    @pytest.mark.parametrize("plan,expected", [
+        (_FIX_PLAN_FULL, {"Task 1", "Task 2", "Task 3", "Task 4"}),
+        (_FIX_PLAN_SKIP, {"Task 1", "Task 2"}),
+    ], ids=["with_tasks", "skips_completed"])
+    def test_read_fix_plan(self, tmp_path, plan, expected):
+        """Test reading open tasks from the fix plan, skipping completed ones."""
         engine = RalphLoopEngine(tmp_path)
-        fix_plan = tmp_path / '@fix_plan.md'
-        fix_plan.write_text("""# Fix Plan
-
-## High Priority
-
-- [ ] Task 1
-- [x] Completed Task
-- [ ] Task 2
-""")
+        (tmp_path / '@fix_plan.md').write_bytes(plan)
         tasks = engine._read_fix_plan()
-        assert len(tasks) == 2
-        assert "Task 1" in tasks
-        assert "Task 2" in tasks
-        assert "Completed Task" not in tasks
+        assert len(tasks) == len(expected)
+        assert set(tasks) == expected
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_study_success(self, mock_call_llm, tmp_path):
+    def test_phase_study_success(self, mock_llm, tmp_path):
         """Test successful Study phase."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.return_value = "Analysis: This task requires implementing X"
+        mock_llm.return_value = "Analysis: This task requires implementing X"
         
         result = engine._phase_study("Test task")
         
         assert result['success'] is True
         assert result['output'] == "Analysis: This task requires implementing X"
-        assert result['phase'] == Phase.STUDY.value
-        mock_call_llm.assert_called_once()
+        assert result['phase'] == _STUDY_VALUE
+        assert mock_llm.call_count == 1
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_study_error(self, mock_call_llm, tmp_path):
+    def test_phase_study_error(self, mock_llm, tmp_path):
         """Test Study phase with error."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.side_effect = Exception("LLM error")
+        mock_llm.side_effect = Exception("LLM error")
         
         result = engine._phase_study("Test task")
         
         assert result['success'] is False
         assert 'error' in result
-        assert result['phase'] == Phase.STUDY.value
+        assert result['phase'] == _STUDY_VALUE
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_implement_success(self, mock_call_llm, tmp_path):
+    @pytest.mark.io
+    def test_phase_implement_success(self, mock_llm, tmp_path):
         """Test successful Implement phase."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.return_value = """```src/main.py
+        mock_llm.return_value = """```src/main.py
 def main():
     print("Hello")
 ```
@@ -225,11 +472,11 @@ def main():
         content = created_file.read_text()
         assert "def main()" in content
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_implement_multiple_files(self, mock_call_llm, tmp_path):
+    @pytest.mark.io
+    def test_phase_implement_multiple_files(self, mock_llm, tmp_path):
         """Test Implement phase with multiple files."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.return_value = """```src/file1.py
+        mock_llm.return_value = """```src/file1.py
 code1
 ```
 ```src/file2.py
@@ -241,297 +488,96 @@ code2
         assert result['success'] is True
         assert len(result['files_created']) == 2
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_implement_error(self, mock_call_llm, tmp_path):
+    def test_phase_implement_error(self, mock_llm, tmp_path):
         """Test Implement phase with error."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.side_effect = Exception("LLM error")
+        mock_llm.side_effect = Exception("LLM error")
         
         result = engine._phase_implement("Create file")
         
         assert result['success'] is False
         assert 'error' in result
     
-    def test_parse_code_blocks_with_path(self):
-        """Test parsing code blocks with explicit paths."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```src/main.py
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'src/main.py'
-        assert 'def main()' in files[0]['content']
-    
-    def test_parse_code_blocks_with_language(self):
-        """Test parsing code blocks with language tag."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```python
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        # Should use default naming since no path detected
-        assert 'generated_0.py' in files[0]['path']
-    
-    def test_parse_code_blocks_multiple(self):
-        """Test parsing multiple code blocks."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```file1.py
-code1
-```
-```file2.py
-code2
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 2
-        assert files[0]['path'] == 'file1.py'
-        assert files[1]['path'] == 'file2.py'
-    
-    def test_parse_code_blocks_no_blocks(self):
-        """Test parsing response with no code blocks."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = "Just some text, no code blocks"
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 0
-    
-    def test_parse_code_blocks_path_with_spaces(self):
-        """Test parsing code blocks with paths containing spaces."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```src/my file.py
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'src/my file.py'
-        assert 'def main()' in files[0]['content']
-    
-    def test_parse_code_blocks_file_marker(self):
-        """Test parsing code blocks with explicit file: marker."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```file: src/main.py
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'src/main.py'
-    
-    def test_parse_code_blocks_empty_block(self):
-        """Test that empty code blocks are skipped."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```python
-
-```
-```src/file.py
-code here
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'src/file.py'
-        assert files[0]['content'] == 'code here'
-    
-    def test_parse_code_blocks_whitespace_only(self):
-        """Test that whitespace-only blocks are skipped."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```python
-   
-```
-```src/file.py
-code here
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'src/file.py'
-    
-    def test_parse_code_blocks_path_in_content(self):
-        """Test extracting path from content when not in specifier."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```python
-# file: src/main.py
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'src/main.py'
-    
-    def test_parse_code_blocks_path_in_content_with_spaces(self):
-        """Test extracting path with spaces from content."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```python
-# path: src/my file.py
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert 'my file.py' in files[0]['path']
-    
-    def test_parse_code_blocks_language_vs_path(self):
-        """Test distinguishing between language tags and file paths."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        # Python language tag should not be treated as path
-        response1 = """```python
-def main():
-    pass
-```
-"""
-        files1 = engine._parse_code_blocks(response1)
-        assert len(files1) == 1
-        assert files1[0]['path'] == 'generated_0.py'  # Should use default, not 'python'
-        
-        # But python.py should be treated as path
-        response2 = """```src/python.py
-def main():
-    pass
-```
-"""
-        files2 = engine._parse_code_blocks(response2)
-        assert len(files2) == 1
-        assert files2[0]['path'] == 'src/python.py'
-    
-    def test_parse_code_blocks_absolute_path(self):
-        """Test parsing absolute paths."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```/absolute/path/to/file.py
-code here
-```
-"""
+    @pytest.mark.parametrize("response,expected_paths,contents", _CODE_BLOCK_CASES)
+    def test_parse_code_blocks(self, engine, response, expected_paths, contents):
+        """Test parsing code blocks into file paths and contents."""
         files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == '/absolute/path/to/file.py'
-    
-    def test_parse_code_blocks_windows_path(self):
-        """Test parsing Windows-style paths."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```src\\file.py
-code here
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert 'file.py' in files[0]['path']
-    
-    def test_parse_code_blocks_no_specifier(self):
-        """Test parsing code blocks without specifier."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```
-def main():
-    pass
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 1
-        assert files[0]['path'] == 'generated_0.py'
-        assert 'def main()' in files[0]['content']
-    
-    def test_parse_code_blocks_multiple_formats(self):
-        """Test parsing multiple code blocks with different formats."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```src/file1.py
-code1
-```
-```python
-code2
-```
-```file: src/file3.py
-code3
-```
-"""
-        files = engine._parse_code_blocks(response)
-        assert len(files) == 3
-        assert files[0]['path'] == 'src/file1.py'
-        assert files[1]['path'] == 'generated_1.py'  # Language tag, not path
-        assert files[2]['path'] == 'src/file3.py'
-    
-    def test_parse_code_blocks_nested_blocks_ignored(self):
-        """Test that nested code blocks don't break parsing."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        response = """```src/file.py
-code with ```nested``` blocks
-```
-"""
-        files = engine._parse_code_blocks(response)
-        # Should still parse the outer block
-        assert len(files) >= 1
-        assert files[0]['path'] == 'src/file.py'
-    
-    def test_extract_file_path_language_tag(self):
+        paths = [file['path'] for file in files]
+        if any(map(callable, expected_paths)):
+            assert len(paths) == len(expected_paths)
+            for path, expected in zip(paths, expected_paths):
+                assert expected(path) if callable(expected) else path == expected, path
+        else:
+            # Exact paths: one list comparison also checks count and order
+            assert paths == expected_paths
+        for file, expected in zip(files, contents or ()):
+            if callable(expected):
+                assert expected(file['content']), file['content']
+            else:
+                assert file['content'] == expected
+    
+    def test_extract_file_path_language_tag(self, engine):
         """Test _extract_file_path with language tag."""
-        engine = RalphLoopEngine(Path("/tmp"))
         path = engine._extract_file_path('python', 'def main(): pass', 0)
         assert path == 'generated_0.py'
     
-    def test_extract_file_path_file_path(self):
+    def test_extract_file_path_language_tag_sets_extension(self, engine):
+        """Test that a language tag picks the extension when the content is ambiguous."""
+        assert engine._extract_file_path('python', 'code2', 1) == 'generated_1.py'
+        assert engine._extract_file_path('bash', 'deploy --prod', 2) == 'generated_2.sh'
+    
+    def test_extract_file_path_file_path(self, engine):
         """Test _extract_file_path with file path."""
-        engine = RalphLoopEngine(Path("/tmp"))
         path = engine._extract_file_path('src/main.py', 'def main(): pass', 0)
         assert path == 'src/main.py'
     
-    def test_extract_file_path_file_marker(self):
+    def test_extract_file_path_file_marker(self, engine):
         """Test _extract_file_path with file: marker."""
-        engine = RalphLoopEngine(Path("/tmp"))
         path = engine._extract_file_path('file: src/main.py', 'def main(): pass', 0)
         assert path == 'src/main.py'
     
-    def test_extract_file_path_from_content(self):
+    def test_extract_file_path_from_content(self, engine):
         """Test _extract_file_path extracting from content."""
-        engine = RalphLoopEngine(Path("/tmp"))
         path = engine._extract_file_path(None, 'file: src/main.py\ndef main(): pass', 0)
         assert path == 'src/main.py'
     
-    def test_extract_file_path_default(self):
+    def test_extract_file_path_hint_stops_at_line_end(self, engine):
+        """Test that a content path hint keeps inner spaces but ends at its line."""
+        path = engine._extract_file_path(None, 'path: src/my file.py\nimport os\n', 0)
+        assert path == 'src/my file.py'
+    
+    def test_extract_file_path_default(self, engine):
         """Test _extract_file_path default naming."""
-        engine = RalphLoopEngine(Path("/tmp"))
         path = engine._extract_file_path(None, 'def main(): pass', 5)
         assert path == 'generated_5.py'
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_test_success(self, mock_call_llm, tmp_path):
+    def test_phase_test_success(self, mock_llm, tmp_path):
         """Test successful Test phase."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.return_value = "Test cases: 1. Unit test 2. Integration test"
+        mock_llm.return_value = "Test cases: 1. Unit test 2. Integration test"
         
         result = engine._phase_test("Test task")
         
         assert result['success'] is True
         assert 'output' in result
-        assert result['phase'] == Phase.TEST.value
+        assert result['phase'] == _TEST_VALUE
     
-    @patch('lib.ralph_loop_engine.call_llm')
-    def test_phase_test_error(self, mock_call_llm, tmp_path):
+    def test_phase_test_error(self, mock_llm, tmp_path):
         """Test Test phase with error."""
         engine = RalphLoopEngine(tmp_path)
-        mock_call_llm.side_effect = Exception("LLM error")
+        mock_llm.side_effect = Exception("LLM error")
         
         result = engine._phase_test("Test task")
         
         assert result['success'] is False
         assert 'error' in result
     
+    @pytest.mark.io
     def test_phase_update_success(self, tmp_path):
         """Test successful Update phase."""
         engine = RalphLoopEngine(tmp_path)
         fix_plan = tmp_path / '@fix_plan.md'
-        fix_plan.write_text("""# Fix Plan
-
-## High Priority
-
-- [ ] Task to complete
-""")
+        fix_plan.write_bytes(_FIX_PLAN_UPDATE)
         
         result = engine._phase_update("Task to complete")
         
@@ -551,52 +597,76 @@ code with ```nested``` blocks
     def test_execute_phase_study(self, tmp_path):
         """Test executing Study phase."""
         engine = RalphLoopEngine(tmp_path)
-        with patch.object(engine, '_phase_study', return_value={'success': True, 'output': 'test'}):
-            result = engine._execute_phase(Phase.STUDY, "Test task")
-            
-            assert result['success'] is True
-            assert engine.current_phase == Phase.STUDY
-            assert len(engine.phase_history) == 1
+        # The engine is thrown away, so override the phase on the instance directly
+        engine._phase_study = lambda task: {'success': True, 'output': 'test'}
+        result = engine._execute_phase(Phase.STUDY, "Test task")
+        
+        assert result['success'] is True
+        assert engine.current_phase == Phase.STUDY
+        assert len(engine.phase_history) == 1
     
     def test_execute_phase_error(self, tmp_path):
         """Test phase execution with error."""
         engine = RalphLoopEngine(tmp_path)
-        with patch.object(engine, '_phase_study', side_effect=Exception("Error")):
-            result = engine._execute_phase(Phase.STUDY, "Test task")
-            
-            assert result['success'] is False
-            assert 'error' in result
-            assert len(engine.phase_history) == 1
-    
-    def test_start_stop(self, tmp_path):
+        # No sleeping retries, and no downgrading the failure to a warning
+        engine.max_retries = 0
+        engine.continue_on_non_critical = False
+        
+        def failing_study(task):
+            raise Exception("Error")
+        
+        engine._phase_study = failing_study
+        result = engine._execute_phase(Phase.STUDY, "Test task")
+        
+        assert result['success'] is False
+        assert result['error'] == "Error"
+        assert len(engine.phase_history) == 1
+    
+    @pytest.mark.io
+    @pytest.mark.xdist_group("engine_loop")
+    def test_start_stop(self, tmp_path, monkeypatch):
         """Test starting and stopping the loop."""
         engine = RalphLoopEngine(tmp_path)
         
         # Create a fix plan with no tasks to make loop exit quickly
         fix_plan = tmp_path / '@fix_plan.md'
-        fix_plan.write_text("# Fix Plan\n\n## High Priority\n\n")
+        fix_plan.write_bytes(_FIX_PLAN_EMPTY)
         
+        # Signal from the loop thread once it is running instead of sleeping, and
+        # hold it there so the empty plan can't finish the loop before the check
+        loop_started = threading.Event()
+        release_loop = threading.Event()
+        run_loop = engine._run_loop
+        
+        def signalling_run_loop():
+            loop_started.set()
+            release_loop.wait(timeout=1)
+            run_loop()
+        
+        monkeypatch.setattr(engine, "_run_loop", signalling_run_loop)
+        
+        start = time.monotonic()
         engine.start()
+        assert loop_started.wait(timeout=1)
         assert engine.is_running is True
-        
-        # Wait a bit for loop to start
-        time.sleep(0.1)
+        release_loop.set()
         
         engine.stop()
+        assert time.monotonic() - start < 0.5
         assert engine.is_running is False
         assert engine.should_stop is True
     
-    def test_start_already_running(self, tmp_path):
+    def test_start_already_running(self, shared_project_dir):
         """Test starting when already running raises error."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         engine.is_running = True
         
         with pytest.raises(RuntimeError, match="already running"):
             engine.start()
     
-    def test_pause_resume(self, tmp_path):
+    def test_pause_resume(self, shared_project_dir):
         """Test pausing and resuming."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         
         engine.pause()
         assert engine.is_paused is True
@@ -604,35 +674,35 @@ code with ```nested``` blocks
         engine.resume()
         assert engine.is_paused is False
     
-    def test_resume_with_input(self, tmp_path):
+    def test_resume_with_input(self, shared_project_dir):
         """Test resuming with user input."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         engine.is_paused = True
         
         engine.resume(user_input="Continue")
         assert engine.is_paused is False
         assert engine.user_input == "Continue"
     
-    def test_set_mode(self, tmp_path):
+    def test_set_mode(self, shared_project_dir):
         """Test changing execution mode."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         assert engine.mode == LoopMode.PHASE_BY_PHASE
         
         engine.set_mode(LoopMode.NON_STOP)
         assert engine.mode == LoopMode.NON_STOP
     
-    def test_set_mode_resumes_if_paused(self, tmp_path):
+    def test_set_mode_resumes_if_paused(self, shared_project_dir):
         """Test that switching to non-stop mode resumes if paused."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         engine.is_paused = True
         engine.mode = LoopMode.PHASE_BY_PHASE
         
         engine.set_mode(LoopMode.NON_STOP)
         assert engine.is_paused is False
     
-    def test_get_status(self, tmp_path):
+    def test_get_status(self, shared_project_dir):
         """Test getting status."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         engine.current_task = "Test task"
         engine.current_phase = Phase.STUDY
         
@@ -640,85 +710,40 @@ code with ```nested``` blocks
         
         assert status['is_running'] is False
         assert status['is_paused'] is False
-        assert status['mode'] == LoopMode.PHASE_BY_PHASE.value
-        assert status['current_phase'] == Phase.STUDY.value
+        assert status['mode'] == _PHASE_BY_PHASE_VALUE
+        assert status['current_phase'] == _STUDY_VALUE
         assert status['current_task'] == "Test task"
         assert 'phase_history' in status
         assert 'status_log' in status
         assert 'files' in status
     
-    def test_wait_for_resume(self, tmp_path):
-        """Test waiting for resume signal."""
-        engine = RalphLoopEngine(tmp_path)
-        engine.is_paused = True
-        engine.should_stop = False
-        
-        # Test that it waits (in a separate thread)
-        def stop_after_delay():
-            time.sleep(0.1)
-            engine.is_paused = False
-        
-        thread = threading.Thread(target=stop_after_delay)
-        thread.start()
+    def test_wait_for_resume(self, shared_project_dir):
+        """Test that waiting returns as soon as resume is signalled."""
+        engine = RalphLoopEngine(shared_project_dir)
+        engine.pause()
+        assert not engine._resume_event.is_set()
         
-        start = time.time()
+        engine._resume_event.set()
+        start = time.monotonic()
         engine._wait_for_resume()
-        elapsed = time.time() - start
+        elapsed = time.monotonic() - start
         
-        # Should have waited at least a bit
-        assert elapsed >= 0.05
-        thread.join()
+        # Event-based wait returns immediately once signalled
+        assert elapsed < 0.05
     
-    def test_file_tracker_integration(self, tmp_path):
+    def test_file_tracker_integration(self, shared_project_dir):
         """Test that file tracker is initialized."""
-        engine = RalphLoopEngine(tmp_path)
+        engine = RalphLoopEngine(shared_project_dir)
         assert engine.file_tracker is not None
-        assert engine.file_tracker.project_path == tmp_path.resolve()
-    
-    def test_infer_file_extension_nodejs(self):
-        """Test file extension inference for Node.js applications."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        nodejs_code = """const fs = require('fs');
-const path = require('path');
-
-function readConfig() {
-  const configPath = path.join(__dirname, 'config.json');
-  return JSON.parse(fs.readFileSync(configPath, 'utf8'));
-}
-
-module.exports = { readConfig };
-"""
-        assert engine._infer_file_extension(nodejs_code) == '.js'
-    
-    def test_infer_file_extension_package_json(self):
-        """Test file extension inference for package.json."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        package_json = '{"name": "test", "version": "1.0.0", "main": "main.js"}'
-        assert engine._infer_file_extension(package_json) == '.json'
-    
-    def test_infer_file_extension_json_with_comments(self):
-        """Test JSON detection with leading comments."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        json_with_comment = """// /app/package.json
-{
-  "name": "test",
-  "version": "1.0.0"
-}"""
-        assert engine._infer_file_extension(json_with_comment) == '.json'
+        assert engine.file_tracker.project_path == shared_project_dir.resolve()
     
-    def test_infer_file_extension_defaults_to_js_not_py(self):
-        """Test that ambiguous code defaults to .js instead of .py."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        ambiguous_code = "const x = 5; function test() { return x; }"
-        assert engine._infer_file_extension(ambiguous_code) == '.js'
+    @pytest.mark.parametrize("code,expected", _INFER_EXTENSION_CASES)
+    def test_infer_file_extension(self, engine, code, expected):
+        """Test file extension inference from code content."""
+        assert engine._infer_file_extension(code) == expected
     
-    def test_parse_code_blocks_strips_leading_metadata(self):
+    def test_parse_code_blocks_strips_leading_metadata(self, engine):
         """Test that code block parsing strips leading metadata comments."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
         response = """```javascript
 // /app/main.js
@@ -736,87 +761,43 @@ server.listen(3000);
         # But metadata should be stripped for detection
         assert engine._strip_leading_metadata(files[0]['content']) == files[0]['content']
     
-    def test_extract_file_path_ignores_comment_patterns(self):
-        """Test that comment patterns like /app/file.js are ignored."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        # Specifier with comment pattern should be ignored
-        path = engine._extract_file_path('/app/package.json', '{"name": "test"}', 0)
-        # Should not use /app/package.json, should detect JSON and use meaningful name
-        assert path == 'package.json' or 'generated' in path
-    
-    def test_extract_file_path_detects_common_nodejs_files(self):
+    def test_extract_file_path_detects_common_nodejs_files(self, engine, snippets):
         """Test detection of common Node.js file names from content."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        main_js = """const fs = require('fs');
-const path = require('path');
-
-function start() {
-  console.log('Application starting...');
-  // Application initialization code
-}
-
-if (require.main === module) {
-  start();
-}
-
-module.exports = { start };
-"""
+        main_js = snippets['nodejs_main']
         path = engine._extract_file_path(None, main_js, 0)
         assert path == 'main.js'
     
-    def test_extract_file_path_detects_package_json(self):
+    def test_extract_file_path_detects_package_json(self, engine):
         """Test detection of package.json from content."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
         package_content = '{"name": "my-app", "version": "1.0.0", "main": "main.js"}'
         path = engine._extract_file_path(None, package_content, 0)
         assert path == 'package.json'
     
-    def test_extract_file_path_detects_index_html(self):
+    def test_extract_file_path_detects_index_html(self, engine, snippets):
         """Test detection of index.html from content."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        html_content = """<!DOCTYPE html>
-<html>
-<head><title>Test</title></head>
-<body><h1>Hello</h1></body>
-</html>"""
+        html_content = snippets['index']
         path = engine._extract_file_path(None, html_content, 0)
         assert path == 'index.html'
     
-    def test_generate_meaningful_filename_nodejs(self):
+    def test_generate_meaningful_filename_nodejs(self, engine, snippets):
         """Test meaningful filename generation for Node.js applications."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        nodejs_code = """const http = require('http');
-const fs = require('fs');
-
-const server = http.createServer((req, res) => {
-  res.writeHead(200, { 'Content-Type': 'text/html' });
-  res.end('<h1>Hello World</h1>');
-});
-
-const PORT = process.env.PORT || 3000;
-server.listen(PORT, () => {
-  console.log(`Server running on port ${PORT}`);
-});
-"""
+        nodejs_code = snippets['nodejs_http_server']
         name = engine._generate_meaningful_filename(nodejs_code, 0, '.js')
         assert name == 'main.js'
     
-    def test_generate_meaningful_filename_package_json(self):
+    def test_generate_meaningful_filename_package_json(self, engine):
         """Test meaningful filename generation for package.json."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
         package_content = '{"name": "test", "version": "1.0.0"}'
         name = engine._generate_meaningful_filename(package_content, 0, '.json')
         assert name == 'package.json'
     
-    def test_strip_leading_metadata_removes_comment_paths(self):
+    def test_strip_leading_metadata_removes_comment_paths(self, engine):
         """Test that leading metadata like /app/file.js is stripped."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
         content = """// /app/package.json
 {
@@ -827,9 +808,8 @@ server.listen(PORT, () => {
         assert '// /app/package.json' not in cleaned
         assert '"name"' in cleaned
     
-    def test_strip_leading_metadata_preserves_code(self):
+    def test_strip_leading_metadata_preserves_code(self, engine):
         """Test that actual code is preserved when stripping metadata."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
         content = """// Some comment
 const x = 5;
@@ -840,179 +820,48 @@ function test() {
         assert 'const x = 5' in cleaned
         assert 'function test()' in cleaned
     
-    def test_infer_file_extension_react(self):
-        """Test file extension inference for React/JSX code."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        react_code = """import React from 'react';
-import { useState } from 'react';
-
-function App() {
-  const [count, setCount] = useState(0);
-  
-  return (
-    <div>
-      <h1>Count: {count}</h1>
-      <button onClick={() => setCount(count + 1)}>Increment</button>
-    </div>
-  );
-}
-
-export default App;
-"""
-        # React code should be detected as JavaScript
-        assert engine._infer_file_extension(react_code) == '.js'
-    
-    def test_infer_file_extension_express(self):
-        """Test file extension inference for Express.js applications."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        express_code = """const express = require('express');
-const app = express();
-
-app.get('/', (req, res) => {
-  res.json({ message: 'Hello World' });
-});
-
-app.listen(3000, () => {
-  console.log('Server running on port 3000');
-});
-"""
-        assert engine._infer_file_extension(express_code) == '.js'
-    
-    def test_infer_file_extension_typescript(self):
-        """Test file extension inference for TypeScript code."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        ts_code = """interface User {
-  id: number;
-  name: string;
-}
-
-function getUser(id: number): User {
-  return { id, name: 'John Doe' };
-}
-
-export default getUser;
-"""
-        assert engine._infer_file_extension(ts_code) == '.ts'
-    
-    def test_extract_file_path_detects_server_js(self):
+    def test_extract_file_path_detects_server_js(self, engine, snippets):
         """Test detection of server.js from Express.js patterns."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        server_code = """const express = require('express');
-const app = express();
-
-app.get('/api/health', (req, res) => {
-  res.json({ status: 'ok' });
-});
-
-const PORT = process.env.PORT || 3000;
-app.listen(PORT, () => {
-  console.log(`Server listening on port ${PORT}`);
-});
-"""
+        server_code = snippets['express_server']
         path = engine._extract_file_path(None, server_code, 0)
         # Should detect as main.js or server.js based on content patterns
         assert path in ['main.js', 'server.js'] or 'generated' in path
     
-    def test_extract_file_path_detects_app_js(self):
+    def test_extract_file_path_detects_app_js(self, engine, snippets):
         """Test detection of app.js from application initialization patterns."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        app_code = """const express = require('express');
-const app = express();
-
-// Middleware setup
-app.use(express.json());
-app.use(express.urlencoded({ extended: true }));
-
-// Routes
-app.get('/', (req, res) => {
-  res.send('Hello World');
-});
-
-module.exports = app;
-"""
+        app_code = snippets['express_app']
         path = engine._extract_file_path(None, app_code, 0)
         # Should detect as main.js or app.js based on content patterns
         assert path in ['main.js', 'app.js'] or 'generated' in path
     
-    def test_extract_file_path_detects_react_component(self):
+    def test_extract_file_path_detects_react_component(self, engine, snippets):
         """Test detection of React component files."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        react_component = """import React from 'react';
-
-function Button({ onClick, children }) {
-  return (
-    <button onClick={onClick} className="btn">
-      {children}
-    </button>
-  );
-}
-
-export default Button;
-"""
+        react_component = snippets['react_button']
         path = engine._extract_file_path(None, react_component, 0)
         # Should detect as .js or .jsx
         assert path.endswith('.js') or path.endswith('.jsx')
     
-    def test_generate_meaningful_filename_express(self):
+    def test_generate_meaningful_filename_express(self, engine, snippets):
         """Test meaningful filename generation for Express.js applications."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        express_code = """const express = require('express');
-const app = express();
-
-app.get('/', (req, res) => {
-  res.send('Hello World');
-});
-
-app.listen(3000);
-"""
+        express_code = snippets['express_minimal']
         name = engine._generate_meaningful_filename(express_code, 0, '.js')
         # Should detect as main.js or server.js
         assert name in ['main.js', 'server.js'] or name is None
     
-    def test_generate_meaningful_filename_react(self):
+    def test_generate_meaningful_filename_react(self, engine, snippets):
         """Test meaningful filename generation for React components."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
-        react_code = """import React, { useState } from 'react';
-
-function Counter() {
-  const [count, setCount] = useState(0);
-  return <div>{count}</div>;
-}
-
-export default Counter;
-"""
+        react_code = snippets['react_counter']
         name = engine._generate_meaningful_filename(react_code, 0, '.js')
         # Should detect as .js or .jsx, or None if no specific pattern
         assert name is None or name.endswith('.js') or name.endswith('.jsx')
     
-    def test_infer_file_extension_generic_javascript(self):
-        """Test file extension inference for generic JavaScript code."""
-        engine = RalphLoopEngine(Path("/tmp"))
-        
-        generic_js = """function calculateTotal(items) {
-  return items.reduce((sum, item) => sum + item.price, 0);
-}
-
-const items = [
-  { name: 'Apple', price: 1.50 },
-  { name: 'Banana', price: 0.75 }
-];
-
-console.log('Total:', calculateTotal(items));
-"""
-        assert engine._infer_file_extension(generic_js) == '.js'
-    
-    def test_extract_file_path_detects_config_json(self):
+    def test_extract_file_path_detects_config_json(self, engine):
         """Test detection of config.json from configuration patterns."""
-        engine = RalphLoopEngine(Path("/tmp"))
         
         config_content = '{"database": {"host": "localhost", "port": 5432}, "api": {"timeout": 5000}}'
         path = engine._extract_file_path(None, config_content, 0)
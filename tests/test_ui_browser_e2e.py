@@ -4,63 +4,127 @@ Browser-based End-to-End Tests for Ralph Ollama UI
 Tests the web application through actual browser interactions using Playwright.
 """
 
+import http.client
+import os
+import re
+import socket
 import sys
 import time
+import urllib.parse
 from pathlib import Path
 
-from lib.path_utils import setup_paths
+import pytest
+
+from lib.path_utils import setup_paths, get_project_root
 setup_paths()
+project_root = get_project_root()
+
+# Server command and working directory, stringified once for every start_server call
+_APP_PY = str(project_root / 'ui' / 'app.py')
+_PROJECT_ROOT_STR = str(project_root)
+
+# Response area text while a prompt is still pending (empty or the placeholder)
+_PENDING_RESPONSE_RE = re.compile(r'^\s*(?:Generating response\.\.\.)?\s*$')
+
+# Return the Ralph Loop tab to its just-loaded state without reloading the page:
+# stop the previous session's stream and clear what it rendered
+_RESET_RALPH_VIEW_JS = """() => {
+    stopRalphStatusPolling();
+    ralphSessionId = null;
+    document.getElementById('ralphStartForm').reset();
+    document.getElementById('ralphControls').style.display = 'none';
+    for (const id of ['ralphStatusArea', 'currentTask', 'statusLog', 'fileList']) {
+        document.getElementById(id).innerHTML = '';
+    }
+}"""
+
+# For each [css selector, text or null] pair: is a visible matching element containing the text present?
+_VISIBLE_ALL_JS = """(checks) => checks.map(([selector, text]) =>
+    [...document.querySelectorAll(selector)].some(
+        el => el.offsetParent !== null && (text === null || el.textContent.includes(text))))"""
 
 try:
     from playwright.sync_api import Page, expect, Browser, BrowserContext
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 except ImportError:
+    if __name__ != '__main__':
+        pytest.skip("Playwright not installed", allow_module_level=True)
     print("ERROR: Playwright not installed. Install with: pip install playwright && playwright install chromium")
     sys.exit(1)
 
 import subprocess
 import shutil
-import requests
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 class BrowserE2ETestRunner:
     """Browser-based e2e test runner using Playwright."""
     
-    def __init__(self, base_url: str = "http://localhost:5001", headless: bool = True):
+    def __init__(self, base_url: str = "http://localhost:5001", headless: bool = True,
+                 record_video: bool = False):
         self.base_url = base_url
         self.headless = headless
+        self.record_video = record_video
         self.server_process: Optional[subprocess.Popen] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._app_loaded = False
         self.test_project_names: List[str] = []
         self.projects_dir = project_root / 'projects'
         
     def start_server(self) -> bool:
         """Start Flask server."""
         try:
+            # Output is discarded: nothing reads it, and a full pipe would block the server
+            port = urllib.parse.urlsplit(self.base_url).port or 5001
             self.server_process = subprocess.Popen(
-                [sys.executable, str(project_root / 'ui' / 'app.py')],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=str(project_root)
+                [sys.executable, _APP_PY],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=_PROJECT_ROOT_STR,
+                env={**os.environ, 'FLASK_PORT': str(port), 'RALPH_UI_TESTING': '1'}
             )
-            
-            # Wait for server to start
-            max_attempts = 30
-            for i in range(max_attempts):
-                try:
-                    response = requests.get(f"{self.base_url}/", timeout=2)
-                    if response.status_code == 200:
-                        return True
-                except Exception:
-                    pass
-                time.sleep(1)
-            
-            return False
+            return self._wait_for_server()
         except Exception:
             return False
     
+    def _wait_for_server(self, timeout: float = 30.0) -> bool:
+        """Wait for the server port to accept connections, then confirm over HTTP.
+        
+        A TCP connect is probed every 25ms, so startup is noticed as soon as the
+        socket listens instead of on the next whole-second poll.
+        
+        Args:
+            timeout: Seconds to wait before giving up
+            
+        Returns:
+            True if the server answers a HEAD request for "/" with 200
+        """
+        parsed = urllib.parse.urlsplit(self.base_url)
+        address = (parsed.hostname, parsed.port or 80)
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.server_process.poll() is not None:
+                return False  # Server exited during startup
+            try:
+                with socket.create_connection(address, timeout=0.1):
+                    break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.025)
+        
+        # HEAD over a plain connection: no body to transfer and no session/pool setup
+        conn = http.client.HTTPConnection(*address, timeout=2)
+        try:
+            conn.request("HEAD", "/")
+            return conn.getresponse().status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+    
     def stop_server(self):
         """Stop Flask server."""
         if self.server_process:
@@ -80,9 +144,13 @@ class BrowserE2ETestRunner:
         self.browser = self.playwright.chromium.launch(headless=self.headless)
         self.context = self.browser.new_context(
             viewport={'width': 1280, 'height': 720},
-            record_video_dir="test-reports/videos/" if not self.headless else None
+            record_video_dir="test-reports/videos/" if self.record_video else None
         )
         self.page = self.context.new_page()
+        # One default for page actions and waits; only those that need a different
+        # limit pass timeout=. expect() assertions don't use it and keep their own
+        self.page.set_default_timeout(10000)
+        self.page.set_default_navigation_timeout(15000)
     
     def teardown_browser(self):
         """Teardown Playwright browser."""
@@ -95,6 +163,45 @@ class BrowserE2ETestRunner:
         if hasattr(self, 'playwright'):
             self.playwright.stop()
     
+    def _open_app(self, reset_ralph: bool = False):
+        """Show the app on the Send Prompt tab, loading the page only when needed.
+        
+        The first call navigates to base_url; later calls reuse the loaded page,
+        so the bundle is not fetched and parsed again for every test.
+        
+        Args:
+            reset_ralph: Clear the previous Ralph loop session from the page
+        """
+        if not self._app_loaded or not self.page.url.startswith(self.base_url):
+            self.page.goto(self.base_url)
+            self._app_loaded = True
+            return
+        
+        if reset_ralph:
+            self.page.evaluate(_RESET_RALPH_VIEW_JS)
+        self.page.locator("button.tab").filter(has_text="Send Prompt").click()
+    
+    def _assert_visible_all(self, checks: List[Tuple[str, Optional[str]]]):
+        """Assert that every check matches a visible element, in one round-trip.
+        
+        Unlike expect(), this does not retry, so only use it once the page has
+        settled (after goto or a synchronous tab switch).
+        
+        Args:
+            checks: (CSS selector, text the element must contain or None) pairs
+        """
+        results = self.page.evaluate(_VISIBLE_ALL_JS, [list(check) for check in checks])
+        missing = [check for check, visible in zip(checks, results) if not visible]
+        assert not missing, f"Not visible: {missing}"
+    
+    def _reset(self):
+        """Stop and drop the server's Ralph loops from earlier tests.
+        
+        Only servers started by this runner enable /test/reset; against an
+        external server the request gets a 404 and loops are left alone.
+        """
+        self.page.request.post(f"{self.base_url}/test/reset")
+    
     def cleanup_test_projects(self):
         """Clean up test projects created during tests."""
         if not self.projects_dir.exists():
@@ -112,17 +219,17 @@ class BrowserE2ETestRunner:
     def test_homepage_loads(self) -> bool:
         """Test that homepage loads correctly."""
         try:
-            self.page.goto(self.base_url)
+            self._open_app()
             
             # Check title
             expect(self.page).to_have_title("Ralph Ollama - Local UI")
             
-            # Check main heading
-            expect(self.page.locator("h1")).to_contain_text("Ralph Ollama")
-            
-            # Check tabs exist (use button selector to avoid matching h2)
-            expect(self.page.locator("button.tab").filter(has_text="Send Prompt")).to_be_visible()
-            expect(self.page.locator("button.tab").filter(has_text="Ralph Loop")).to_be_visible()
+            # Check main heading and tabs (use button selector to avoid matching h2)
+            self._assert_visible_all([
+                ("h1", "Ralph Ollama"),
+                ("button.tab", "Send Prompt"),
+                ("button.tab", "Ralph Loop"),
+            ])
             
             return True
         except Exception as e:
@@ -132,27 +239,25 @@ class BrowserE2ETestRunner:
     def test_tab_switching(self) -> bool:
         """Test tab switching functionality."""
         try:
-            self.page.goto(self.base_url)
+            self._open_app()
             
             # Click Ralph Loop tab
             self.page.click("text=Ralph Loop")
             
-            # Verify Ralph Loop tab is active
-            ralph_tab = self.page.locator("text=Ralph Loop").first
-            expect(ralph_tab).to_have_class("tab active")
-            
-            # Verify Ralph Loop content is visible
-            expect(self.page.locator("text=Start New Project")).to_be_visible()
+            # Verify Ralph Loop tab is active and its content is visible
+            self._assert_visible_all([
+                ("button.tab.active", "Ralph Loop"),
+                ("#ralphTab h2", "Start New Project"),
+            ])
             
             # Click back to Prompt tab
             self.page.click("text=Send Prompt")
             
-            # Verify Prompt tab is active
-            prompt_tab = self.page.locator("text=Send Prompt").first
-            expect(prompt_tab).to_have_class("tab active")
-            
-            # Verify Prompt form is visible
-            expect(self.page.locator("#promptForm")).to_be_visible()
+            # Verify Prompt tab is active and the form is visible
+            self._assert_visible_all([
+                ("button.tab.active", "Send Prompt"),
+                ("#promptForm", None),
+            ])
             
             return True
         except Exception as e:
@@ -162,7 +267,7 @@ class BrowserE2ETestRunner:
     def test_prompt_workflow(self) -> bool:
         """Test complete prompt workflow."""
         try:
-            self.page.goto(self.base_url)
+            self._open_app()
             
             # Wait for form to be visible
             expect(self.page.locator("#promptForm")).to_be_visible()
@@ -171,21 +276,19 @@ class BrowserE2ETestRunner:
             prompt_textarea = self.page.locator("#prompt")
             prompt_textarea.fill("Say hello in exactly one word.")
             
-            # Submit form
+            # Submit form; wake once when /api/generate answers instead of
+            # re-evaluating a page predicate for the whole generation
             submit_btn = self.page.locator("#submitBtn")
-            submit_btn.click()
-            
-            # Wait for response (button should show loading state)
-            expect(submit_btn).to_be_disabled(timeout=1000)
-            
-            # Wait for response area to have content (not just "Generating...")
+            with self.page.expect_response(lambda response: response.url.endswith('/api/generate'),
+                                           timeout=60000):
+                submit_btn.click()
+                
+                # Button shows loading state while the request is in flight
+                expect(submit_btn).to_be_disabled(timeout=1000)
+            
+            # The page renders the response as soon as the fetch resolves
             response_area = self.page.locator("#responseArea")
-            # Wait for response to appear (should not be empty and not be "Generating...")
-            self.page.wait_for_function(
-                "document.getElementById('responseArea').textContent.trim() !== '' && "
-                "document.getElementById('responseArea').textContent.trim() !== 'Generating response...'",
-                timeout=60000
-            )
+            expect(response_area).not_to_have_text(_PENDING_RESPONSE_RE, timeout=5000)
             
             # Verify response is displayed
             response_text = response_area.text_content()
@@ -204,7 +307,8 @@ class BrowserE2ETestRunner:
     def test_ralph_loop_start(self) -> bool:
         """Test starting a Ralph loop."""
         try:
-            self.page.goto(self.base_url)
+            self._reset()
+            self._open_app(reset_ralph=True)
             
             # Switch to Ralph Loop tab
             self.page.click("text=Ralph Loop")
@@ -243,7 +347,8 @@ class BrowserE2ETestRunner:
     def test_ralph_loop_status_updates(self) -> bool:
         """Test that status updates appear in UI."""
         try:
-            self.page.goto(self.base_url)
+            self._reset()
+            self._open_app(reset_ralph=True)
             
             # Start a loop first
             self.page.click("text=Ralph Loop")
@@ -258,8 +363,11 @@ class BrowserE2ETestRunner:
             # Wait for controls
             expect(self.page.locator("#ralphControls")).to_be_visible(timeout=10000)
             
-            # Wait a bit for status to update
-            time.sleep(3)
+            # Wait until the first status entry is rendered
+            self.page.wait_for_function(
+                "document.getElementById('statusLog').textContent.trim().length > 0",
+                timeout=15000
+            )
             
             # Check that status log has entries
             status_log = self.page.locator("#statusLog")
@@ -280,7 +388,8 @@ class BrowserE2ETestRunner:
     def test_ralph_loop_controls(self) -> bool:
         """Test Ralph loop control buttons."""
         try:
-            self.page.goto(self.base_url)
+            self._reset()
+            self._open_app(reset_ralph=True)
             
             # Start a loop in non-stop mode (pause button will be visible)
             self.page.click("text=Ralph Loop")
@@ -301,29 +410,20 @@ class BrowserE2ETestRunner:
             # Wait for pause button to be visible (not hidden)
             expect(pause_btn).to_be_visible(timeout=15000)
             
-            # Test pause button
+            # Test pause button; the resume button appears once the pause takes effect
             pause_btn.click()
-            time.sleep(1)  # Wait for pause to take effect
-            
-            # Wait a bit for pause to take effect
-            time.sleep(2)
-            
-            # Resume button should appear
             resume_btn = self.page.locator("#resumeBtn")
             expect(resume_btn).to_be_visible(timeout=5000)
             
-            # Test stop button
+            # Test stop button, accepting the confirm dialog (registered before
+            # the click, otherwise Playwright dismisses it and nothing stops)
             stop_btn = self.page.locator("#stopBtn")
             expect(stop_btn).to_be_visible()
+            self.page.once("dialog", lambda dialog: dialog.accept())
             stop_btn.click()
             
-            # Confirm stop dialog if it appears
-            try:
-                self.page.on("dialog", lambda dialog: dialog.accept())
-            except Exception:
-                pass
-            
-            time.sleep(1)
+            # Controls are hidden once the stop request succeeds
+            expect(self.page.locator("#ralphControls")).to_be_hidden(timeout=5000)
             
             return True
         except Exception as e:
@@ -335,7 +435,8 @@ class BrowserE2ETestRunner:
     def test_file_list_updates(self) -> bool:
         """Test that file list updates when files are created."""
         try:
-            self.page.goto(self.base_url)
+            self._reset()
+            self._open_app(reset_ralph=True)
             
             # Start a loop
             self.page.click("text=Ralph Loop")
@@ -350,8 +451,11 @@ class BrowserE2ETestRunner:
             # Wait for controls
             expect(self.page.locator("#ralphControls")).to_be_visible(timeout=10000)
             
-            # Wait for file list to potentially update
-            time.sleep(5)
+            # Wait for the first tracked file; an empty list is still acceptable
+            try:
+                self.page.wait_for_selector("#fileList .file-item")
+            except PlaywrightTimeoutError:
+                pass
             
             # Check file list exists
             file_list = self.page.locator("#fileList")
@@ -368,6 +472,17 @@ class BrowserE2ETestRunner:
                 self.page.screenshot(path="test-reports/file-list-failure.png")
             return False
     
+    # (display name, method) for every browser test, in run order
+    TESTS = (
+        ("Homepage loads", 'test_homepage_loads'),
+        ("Tab switching", 'test_tab_switching'),
+        ("Prompt workflow", 'test_prompt_workflow'),
+        ("Ralph loop start", 'test_ralph_loop_start'),
+        ("Status updates", 'test_ralph_loop_status_updates'),
+        ("Controls", 'test_ralph_loop_controls'),
+        ("File list updates", 'test_file_list_updates'),
+    )
+    
     def run_all_tests(self, start_server: bool = True) -> int:
         """Run all browser tests."""
         print("=" * 70)
@@ -384,7 +499,6 @@ class BrowserE2ETestRunner:
                     print("❌ Failed to start server")
                     return 1
                 print("✅ Server started")
-                time.sleep(2)
             
             # Setup browser
             print("\n🌐 Setting up browser...")
@@ -393,20 +507,12 @@ class BrowserE2ETestRunner:
             
             # Create test reports directory
             Path("test-reports").mkdir(exist_ok=True)
-            Path("test-reports/videos").mkdir(exist_ok=True)
+            if self.record_video:
+                Path("test-reports/videos").mkdir(exist_ok=True)
             
             # Run tests
-            tests = [
-                ("Homepage loads", self.test_homepage_loads),
-                ("Tab switching", self.test_tab_switching),
-                ("Prompt workflow", self.test_prompt_workflow),
-                ("Ralph loop start", self.test_ralph_loop_start),
-                ("Status updates", self.test_ralph_loop_status_updates),
-                ("Controls", self.test_ralph_loop_controls),
-                ("File list updates", self.test_file_list_updates),
-            ]
-            
-            for test_name, test_func in tests:
+            for test_name, method_name in self.TESTS:
+                test_func = getattr(self, method_name)
                 print(f"\n📝 Testing: {test_name}...")
                 try:
                     if test_func():
@@ -447,6 +553,40 @@ class BrowserE2ETestRunner:
                 self.stop_server()
 
 
+@pytest.fixture(scope="session")
+def browser_runner():
+    """Start a UI server and browser once per pytest(-xdist) worker.
+    
+    Each worker gets its own port (5001 for gw0/no xdist, 5002 for gw1, ...),
+    so the tests can run in parallel with pytest -n.
+    """
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+    port = 5001 + int(worker.lstrip('gw') or 0)
+    runner = BrowserE2ETestRunner(base_url=f"http://localhost:{port}")
+    if not runner.start_server():
+        runner.stop_server()
+        pytest.skip(f"UI server did not start on port {port}")
+    Path("test-reports").mkdir(exist_ok=True)
+    runner.setup_browser()
+    try:
+        yield runner
+    finally:
+        runner.cleanup_test_projects()
+        runner.teardown_browser()
+        runner.stop_server()
+
+
+@pytest.mark.browser
+@pytest.mark.parametrize(
+    "method_name",
+    [method_name for _, method_name in BrowserE2ETestRunner.TESTS],
+    ids=[name.replace(' ', '-').lower() for name, _ in BrowserE2ETestRunner.TESTS]
+)
+def test_browser(browser_runner, method_name):
+    """Run one browser test against this worker's server."""
+    assert getattr(browser_runner, method_name)()
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -458,12 +598,15 @@ def main():
                        help='Assume server is already running')
     parser.add_argument('--headed', action='store_true',
                        help='Run browser in headed mode (not headless)')
+    parser.add_argument('--record-video', action='store_true',
+                       help='Record videos of the browser session to test-reports/videos/')
     
     args = parser.parse_args()
     
     runner = BrowserE2ETestRunner(
         base_url=args.url,
-        headless=not args.headed
+        headless=not args.headed,
+        record_video=args.record_video
     )
     exit_code = runner.run_all_tests(start_server=not args.no_start_server)
     
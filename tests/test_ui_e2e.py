@@ -70,10 +70,11 @@ class UITestRunner:
         """Start the Flask server."""
         self.log("\n🚀 Starting Flask server...", BLUE)
         try:
+            # Output is discarded: nothing reads it, and a full pipe would block the server
             self.server_process = subprocess.Popen(
                 [sys.executable, str(project_root / 'ui' / 'app.py')],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 cwd=str(project_root)
             )
             
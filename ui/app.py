@@ -8,8 +8,9 @@ import sys
 import os
 import json
 import time
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Union
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, Response
 from flask_cors import CORS
@@ -41,6 +42,8 @@ adapter: Optional[RalphOllamaAdapter] = None
 
 # Ralph loop engines (keyed by session ID or project path)
 ralph_loops: Dict[str, RalphLoopEngine] = {}
+# Guards adding loops to ralph_loops against the test reset clearing it
+ralph_loops_lock = threading.Lock()
 
 def init_clients() -> None:
     """Initialize Ollama clients."""
@@ -334,7 +337,8 @@ def ralph_start() -> Tuple[Response, int]:
             ralph_loops[session_id].stop()
         
         loop_engine = RalphLoopEngine(project_dir, adapter, model=model)
-        ralph_loops[session_id] = loop_engine
+        with ralph_loops_lock:
+            ralph_loops[session_id] = loop_engine
         
         # Initialize project only if it's new
         if not is_existing_project:
@@ -858,6 +862,21 @@ def ralph_stream() -> Response:
     return response
 
 
+@app.route('/test/reset', methods=['POST'])
+def reset_for_tests() -> Tuple[Union[Response, str], int]:
+    """Stop and forget every Ralph loop; only enabled when RALPH_UI_TESTING=1."""
+    if os.getenv('RALPH_UI_TESTING') != '1':
+        return jsonify({'error': 'Not found', 'success': False}), 404
+    
+    with ralph_loops_lock:
+        loops = list(ralph_loops.items())
+        ralph_loops.clear()
+    # Stop outside the lock: stop() joins the loop thread
+    for _, loop_engine in loops:
+        loop_engine.stop()
+    return '', 204
+
+
 def main():
     """Main entry point for UI server."""
     # Use port from environment or default to 5001 (5000 is often used by AirPlay on macOS)